@@ -0,0 +1,223 @@
+'''
+Benchmarks of the hot paths of the scenes.
+
+    python bench.py [benchmark ...]
+    python bench.py --compare OLD.json NEW.json
+
+Results are written to `bench-results/<git revision>.json`, with one entry
+per benchmark and per size, so that runs on different commits can be
+compared with `--compare`.
+'''
+
+import argparse
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+from importlib import metadata
+from statistics import median
+from time import perf_counter
+
+import networkx as nx
+import numpy as np
+
+from manim import QUALITIES, Axes, config, tempconfig
+
+from cayley import CayleyGraph
+from ecc import EC, GroupLaw
+import ssg
+from supersingular import Graph, SSGraph
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+RESULTS = os.path.join(HERE, 'bench-results')
+
+# Each run in a fresh interpreter; prints its time and the heavy modules
+# it imported
+STARTUP = '''
+import json, sys, time
+t = time.perf_counter()
+%s
+t = time.perf_counter() - t
+print(json.dumps([t, sorted({'networkx', 'scipy', 'manim'} & sys.modules.keys())]))
+'''
+
+# A pool created from scratch, and its first job
+WORKER = '''
+from precompute import Jobs
+jobs = Jobs()
+jobs.path('path', {0: [1], 1: []}, 0, 1)
+jobs['path']
+'''
+
+
+def timed(func, repeat=3):
+    '''
+    Median wall time of `repeat` calls, and the value of the last one.
+    '''
+    times = []
+    for _ in range(repeat):
+        t = perf_counter()
+        value = func()
+        times.append(perf_counter() - t)
+    return median(times), value
+
+
+def primitive_root(p):
+    return next(g for g in range(2, p)
+                if len({pow(g, i, p) for i in range(p - 1)}) == p - 1)
+
+
+def bench_graph():
+    results = []
+    for n in (50, 100, 200, 400):
+        g = nx.random_regular_graph(3, n, seed=0)
+        # Graph builds its mobjects on first use: time construction (mostly
+        # the layout) apart from materializing the mobject tree
+        construct, graph = timed(lambda: Graph([g]))
+        total, family = timed(lambda: Graph([g]).get_family())
+        results.append({'vertices': n, 'construct': construct,
+                        'materialize': total - construct, 'mobjects': len(family)})
+    return results
+
+
+def bench_cayley():
+    results = []
+    for p in (19, 37, 73, 139, 277):
+        gen = primitive_root(p)
+        t, graph = timed(lambda: CayleyGraph(N=p - 1, gen=gen, radius=3,
+                                             edge_dirs=(1, -5, -2), label_func=None))
+        results.append({'N': p - 1, 'construct': t, 'mobjects': len(graph.get_family())})
+    return results
+
+
+def bench_ec_plot():
+    axes = Axes(x_min=-9, x_max=9, y_min=-12, y_max=12)
+    results = []
+    for a, c in ((-6, 10), (1, 1)):
+        t, ec = timed(lambda: EC(a, c).plot(-9, 9, axes))
+        results.append({'curve': [a, c], 'plot': t,
+                        'points': sum(len(m.points) for m in ec.get_family())})
+    return results
+
+
+def bench_path(queries=1000):
+    graph = Graph([ssg.ssg2])
+    rng = random.Random(0)
+    pairs = [rng.sample(graph.nodes, 2) for _ in range(queries)]
+    t, _ = timed(lambda: [graph.path(a, b) for a, b in pairs], repeat=1)
+    return [{'vertices': len(graph.nodes), 'queries': queries, 'rate': queries / t}]
+
+
+def render_fps(scene_cls):
+    low = QUALITIES['low_quality']
+    with tempfile.TemporaryDirectory() as media_dir, tempconfig({
+            'pixel_width': low['pixel_width'], 'pixel_height': low['pixel_height'],
+            'frame_rate': low['frame_rate'], 'media_dir': media_dir,
+            'disable_caching': True, 'write_to_movie': True}):
+        t = perf_counter()
+        scene = scene_cls()
+        scene.render()
+        t = perf_counter() - t
+        frames = round(scene.renderer.time * config['frame_rate'])
+    return {'scene': scene_cls.__name__, 'frames': frames, 'wall': t, 'fps': frames / t}
+
+
+def bench_fps():
+    return [render_fps(GroupLaw), render_fps(SSGraph)]
+
+
+def startup(code, repeat=3):
+    runs = [json.loads(subprocess.run([sys.executable, '-c', STARTUP % code], cwd=HERE,
+                                      capture_output=True, text=True, check=True).stdout)
+            for _ in range(repeat)]
+    return median(t for t, _ in runs), runs[-1][1]
+
+
+def bench_startup():
+    results = []
+    for module in ('precompute', 'ssg', 'cayley', 'supersingular'):
+        t, imported = startup('import %s' % module)
+        results.append({'module': module, 'import': t, 'imports': imported})
+    t, imported = startup(WORKER)
+    results.append({'module': 'worker', 'first job': t, 'imports': imported})
+    return results
+
+
+BENCHMARKS = {
+    'graph': bench_graph,
+    'cayley': bench_cayley,
+    'ec_plot': bench_ec_plot,
+    'path': bench_path,
+    'fps': bench_fps,
+    'startup': bench_startup,
+}
+
+
+def package_version(name):
+    try:
+        return metadata.version(name)
+    except metadata.PackageNotFoundError:
+        return None
+
+
+def revision():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+
+def run(names):
+    rev = revision()
+    report = {
+        'revision': rev,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'numpy': np.__version__,
+        'manim': package_version('manimce'),
+        'results': {},
+    }
+    for name in names:
+        print(name, file=sys.stderr)
+        report['results'][name] = BENCHMARKS[name]()
+    os.makedirs(RESULTS, exist_ok=True)
+    path = os.path.join(RESULTS, '%s.json' % rev)
+    with open(path, 'w') as f:
+        json.dump(report, f, indent=1)
+    return path
+
+
+def compare(old, new):
+    '''
+    Print the ratio new/old of every timing found in both reports.
+    '''
+    with open(old) as f:
+        old = json.load(f)['results']
+    with open(new) as f:
+        new = json.load(f)['results']
+    for name in sorted(old.keys() & new.keys()):
+        for a, b in zip(old[name], new[name]):
+            for key, value in b.items():
+                if isinstance(value, float) and a.get(key):
+                    label = {k: v for k, v in b.items() if not isinstance(v, float)}
+                    print('%-8s %-10s %6.2fx  %s' % (name, key, value / a[key], label))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmark the hot paths of the scenes.')
+    parser.add_argument('benchmarks', nargs='*',
+                        help='benchmarks to run, among %s (default: all)' % ', '.join(BENCHMARKS))
+    parser.add_argument('--compare', nargs=2, metavar=('OLD', 'NEW'),
+                        help='compare two result files instead of running')
+    args = parser.parse_args()
+    unknown = set(args.benchmarks) - set(BENCHMARKS)
+    if unknown:
+        parser.error('unknown benchmarks: %s' % ', '.join(sorted(unknown)))
+    if args.compare:
+        compare(*args.compare)
+    else:
+        print(run(args.benchmarks or list(BENCHMARKS)))
@@ -0,0 +1,138 @@
+'''
+Performance budgets of the scenes.
+
+    python budget.py [--allow-missing] [module.Scene ...]
+    python budget.py --update [module.Scene ...]
+
+Every scene is rendered in its own process at preview quality, over the
+animations of `sample` in budgets.json, without writing a movie.  The
+check fails when the wall time, the peak RSS or the largest number of
+mobjects on screen exceeds the budget recorded for the scene, or when
+the scene has no budget, unless `--allow-missing` is given.  `--update`
+records the measurements, with the headroom given in budgets.json, as the
+new budgets.
+'''
+
+import argparse
+import importlib
+import inspect
+import json
+import os
+import subprocess
+import sys
+from time import perf_counter
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+BUDGETS = os.path.join(HERE, 'budgets.json')
+MODULES = ('ecc', 'cayley', 'supersingular', 'timelapse')
+METRICS = ('wall', 'peak_rss', 'mobjects')
+
+
+def scenes(module_name):
+    '''
+    The renderable scenes of a module: those with a `construct` and no
+    subclasses in the same module.
+    '''
+    from manim import Scene
+    module = importlib.import_module(module_name)
+    classes = [cls for cls in vars(module).values()
+               if inspect.isclass(cls) and issubclass(cls, Scene)
+               and cls.__module__ == module_name]
+    return ['%s.%s' % (module_name, cls.__name__) for cls in classes
+            if cls.construct is not Scene.construct
+            and not any(c is not cls and issubclass(c, cls) for c in classes)]
+
+
+def measure(name, sample):
+    '''
+    Render scene `name` and return its metrics.  Meant to run in a fresh
+    process, so that peak RSS is the scene's own.
+    '''
+    from manim import QUALITIES, tempconfig
+    from memory import peak_rss
+    module_name, scene_name = name.rsplit('.', 1)
+    scene_cls = getattr(importlib.import_module(module_name), scene_name)
+    preview = QUALITIES[sample['quality']]
+    with tempconfig({
+            'pixel_width': preview['pixel_width'], 'pixel_height': preview['pixel_height'],
+            'frame_rate': preview['frame_rate'],
+            'from_animation_number': sample['from'], 'upto_animation_number': sample['upto'],
+            'disable_caching': True, 'write_to_movie': False, 'save_last_frame': False}):
+        t = perf_counter()
+        scene = scene_cls()
+        renderer = scene.renderer
+        play = renderer.play
+        most = [0]
+
+        def counted_play(*args, **kwargs):
+            try:
+                return play(*args, **kwargs)
+            finally:
+                most[0] = max(most[0], len(scene.get_mobject_family_members()))
+
+        renderer.play = counted_play
+        scene.render()
+        return {'wall': perf_counter() - t, 'peak_rss': peak_rss(), 'mobjects': most[0]}
+
+
+def run(name):
+    out = subprocess.run([sys.executable, __file__, '--measure', name], cwd=HERE,
+                         capture_output=True, text=True)
+    if out.returncode:
+        sys.stderr.write(out.stderr)
+        raise RuntimeError('rendering %s failed' % name)
+    return json.loads(out.stdout.splitlines()[-1])
+
+
+def check(budgets, names, allow_missing=False):
+    failures = 0
+    for name in names:
+        budget = budgets['scenes'].get(name)
+        if budget is None:
+            failures += not allow_missing
+            print('%-32s %s  no budget: record one with --update' % (
+                name, 'skip' if allow_missing else 'MISSING'))
+            continue
+        measured = run(name)
+        over = [m for m in METRICS if measured[m] > budget[m]]
+        failures += bool(over)
+        print('%-32s %s  %s' % (name, 'OVER' if over else 'ok  ', '  '.join(
+            '%s %.4g/%.4g' % (m, measured[m], budget[m]) for m in METRICS)))
+    return failures
+
+
+def update(budgets, names):
+    headroom = budgets['headroom']
+    for name in names:
+        measured = run(name)
+        budgets['scenes'][name] = {
+            'wall': round(measured['wall'] * headroom, 2),
+            'peak_rss': int(measured['peak_rss'] * headroom),
+            'mobjects': int(measured['mobjects'] * headroom),
+        }
+        print(name, budgets['scenes'][name])
+    budgets['scenes'] = dict(sorted(budgets['scenes'].items()))
+    with open(BUDGETS, 'w') as f:
+        json.dump(budgets, f, indent=1)
+        f.write('\n')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Check the performance budgets of the scenes.')
+    parser.add_argument('scenes', nargs='*', help='module.Scene names (default: all)')
+    parser.add_argument('--update', action='store_true',
+                        help='record the measurements as the new budgets')
+    parser.add_argument('--allow-missing', action='store_true',
+                        help='skip scenes without a budget instead of failing')
+    parser.add_argument('--measure', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    with open(BUDGETS) as f:
+        budgets = json.load(f)
+    if args.measure:
+        print(json.dumps(measure(args.measure, budgets['sample'])))
+        sys.exit()
+    names = args.scenes or [name for module in MODULES for name in scenes(module)]
+    if args.update:
+        update(budgets, names)
+    else:
+        sys.exit(check(budgets, names, args.allow_missing) > 0)
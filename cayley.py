@@ -2,11 +2,19 @@ import numpy as np
 from manim import *
 from itertools import cycle
 from random import shuffle
+from fingerprint import Fingerprinted
+from field import GFp
 
-class CayleyGraph(Mobject):
+class CayleyGraph(Fingerprinted, Mobject):
+    '''
+    The Cayley graph of ℤ/Nℤ with generators `edge_dirs`, on a circle.
+
+    With `bundle`, the edges of each generator are drawn by a single
+    VMobject, for graphs with thousands of vertices.
+    '''
     def __init__(self, N, gen, radius, edge_dirs, edge_bends=[1, -1],
                  color=BLACK, edge_colors=[BLUE, RED, GREEN],
-                 label_func=True,
+                 label_func=True, bundle=False,
                  **kwargs):
         super().__init__(**kwargs)
         self.N = N
@@ -15,7 +23,12 @@ class CayleyGraph(Mobject):
         self.edge_dirs = edge_dirs
         self.edge_bends = edge_bends
         self.edge_colors = edge_colors
-        self.dlog = {self.gen**i % (self.N+1) : i for i in range(self.N)}
+        self.powers = GFp(self.N + 1).powers(self.gen, self.N).tolist()
+        self.dlog = {g: i for i, g in enumerate(self.powers)}
+        self._shortest = None
+        self.bundle = bundle
+        self.set_fingerprint_params(N, gen, radius, edge_dirs, edge_bends, color,
+                                    edge_colors, label_func is not None, bundle, kwargs)
         
         self.vertices = [self.vertex(i, color=color, **kwargs)
                          for i in range(self.N)]
@@ -29,8 +42,12 @@ class CayleyGraph(Mobject):
         for jump, α, col in zip(self.edge_dirs,
                                 cycle(self.edge_bends),
                                 cycle(self.edge_colors)):
-            self.edges.append([self.edge(i, jump, α, color=col, z_index=-1)
-                               for i in range(self.N)])
+            if bundle:
+                self.edges.append([self.arcs(np.arange(self.N), np.full(self.N, jump),
+                                             np.full(self.N, α), color=col, z_index=-1)])
+            else:
+                self.edges.append([self.edge(i, jump, α, color=col, z_index=-1)
+                                   for i in range(self.N)])
             self.add(*self.edges[-1])
 
     def polar(self, ρ, θ):
@@ -58,7 +75,7 @@ class CayleyGraph(Mobject):
                 yield e
             
     def _label_func(self, n):
-        return 'G' if n == 0 else '[%d]G' % (self.gen**n % (self.N + 1))
+        return 'G' if n == 0 else '[%d]G' % self.powers[n]
     
     def label(self, n, label_func=True, **kwargs):
         if not callable(label_func):
@@ -76,6 +93,78 @@ class CayleyGraph(Mobject):
             return ArcBetweenPoints(self.vertex_pos(n), self.vertex_pos(n + jump),
                                     angle=bend, **kwargs)
 
+    def arcs(self, starts, jumps, bends, pieces=8, **kwargs):
+        '''
+        A VMobject drawing, like `edge`, the arcs from vertices `starts` to
+        `starts + jumps`, bent by `bends`.  All arcs are computed at once,
+        as `pieces` cubic curves each.
+        '''
+        centres = np.array([v.get_center() for v in self.vertices])
+        a = centres[np.asarray(starts) % self.N]
+        b = centres[(np.asarray(starts) + jumps) % self.N]
+        bends = np.asarray(bends, dtype=float)[:, None]
+        chord = b - a
+        normal = np.stack([-chord[:, 1], chord[:, 0], np.zeros(len(chord))], axis=1)
+        # The arc turns by `bend` about a centre left of the chord for
+        # positive bends, right for negative ones
+        centre = (a + b)/2 + normal / (2*np.tan(bends/2))
+        r = np.linalg.norm(a - centre, axis=1)[:, None]
+        start = np.arctan2(*(a - centre)[:, 1::-1].T)[:, None]
+        angles = start + bends * np.linspace(0, 1, pieces + 1)
+        points = centre[:, None, :] + r[:, :, None] * np.stack(
+            [np.cos(angles), np.sin(angles), np.zeros_like(angles)], axis=2)
+        tangents = np.stack([-np.sin(angles), np.cos(angles), np.zeros_like(angles)], axis=2)
+        handle = (4/3 * np.tan(bends / (4*pieces)) * r)[:, :, None] * tangents
+        arcs = VMobject(**kwargs)
+        arcs.set_anchors_and_handles(points[:, :-1].reshape(-1, 3),
+                                     (points[:, :-1] + handle[:, :-1]).reshape(-1, 3),
+                                     (points[:, 1:] - handle[:, 1:]).reshape(-1, 3),
+                                     points[:, 1:].reshape(-1, 3))
+        return arcs
+
+    def shortest(self, exponents):
+        '''
+        The shortest exponent vector equivalent to `exponents` modulo the
+        relation lattice, that is reaching the same vertex.  Shortest
+        vectors of all vertices are found once, by a breadth-first search
+        of the graph.
+        '''
+        if self._shortest is None:
+            k = len(self.edge_dirs)
+            steps = np.concatenate([np.eye(k, dtype=np.int64), -np.eye(k, dtype=np.int64)])
+            moves = steps @ np.array(self.edge_dirs)
+            self._shortest = np.zeros((self.N, k), dtype=np.int64)
+            seen = np.zeros(self.N, bool)
+            seen[0] = True
+            frontier = np.array([0])
+            while len(frontier):
+                reached = (frontier[:, None] + moves) % self.N
+                new, first = np.unique(reached, return_index=True)
+                first, new = first[~seen[new]], new[~seen[new]]
+                self._shortest[new] = (self._shortest[frontier[first // len(moves)]]
+                                       + steps[first % len(moves)])
+                seen[new] = True
+                frontier = new
+        return self._shortest[self.endpoint(exponents)]
+
+    def endpoint(self, exponents, start=0):
+        return (start + int(np.dot(exponents, self.edge_dirs))) % self.N
+
+    def walk(self, exponents, start=0, **kwargs):
+        '''
+        The walk from `start` taking each generator as many times as its
+        exponent, as one VMobject per generator used, and its end.
+        '''
+        walk = VGroup()
+        for e, jump, bend, col in zip(exponents, self.edge_dirs,
+                                      cycle(self.edge_bends), cycle(self.edge_colors)):
+            if e:
+                sign = np.sign(e)
+                walk.add(self.arcs(start + sign*jump*np.arange(abs(e)), np.full(abs(e), sign*jump),
+                                   np.full(abs(e), sign*bend), color=col, **kwargs))
+                start = (start + e*jump) % self.N
+        return walk, start
+
     def path(self, path, start=0, **kwargs):
         edges = []
         for d, jump, bend, col in zip(path, cycle(self.edge_dirs),
@@ -186,39 +275,60 @@ class Cayley(Scene):
         self.wait()
 
 class KeyExchange(Scene):
+    '''
+    Alice and Bob walk from the base curve along their secret exponent
+    vectors, then along each other's from the other's public curve.  With
+    `reduce`, secrets are first reduced to the shortest equivalent walks.
+    '''
+    keys = ([2, -1, 2], [-3, 0, 2])
+    reduce = False
+
+    def label(self, i):
+        return str([244, 91, 405, 280, 93, 174, 569, 245, 585,
+                    504, 309, 390, 540, 140, 387, 343, 391, 13][i])
+
+    def make_graph(self):
+        return CayleyGraph(N=18, gen=2, radius=3,
+                           edge_dirs=(1,-5,-2), edge_bends=[1,1.5,1],
+                           label_func=self.label, size=0.8).shift(2*LEFT)
+
+    def draw_walk(self, graph, key):
+        '''
+        The drawing of the walk along `key`, and its end: an arrow per
+        edge, or with `reduce` or a bundled graph, a VMobject per generator.
+        '''
+        if self.reduce or graph.bundle:
+            return graph.walk(key, stroke_width=5)
+        path, end = graph.path(key, tip=True, stroke_width=5)
+        # Edges are placed from the layout, before the graph was shifted
+        shift = graph.vertices[0].get_center() - graph.vertex_pos(0)
+        return Group(*path).shift(shift), end % graph.N
+
     def construct(self):
-        jinvs = lambda i: str([244, 91, 405, 280, 93, 174, 569, 245, 585,
-                               504, 309, 390, 540, 140, 387, 343, 391, 13][i])
-        graph = CayleyGraph(N=18, gen=2, radius=3,
-                            edge_dirs=(1,-5,-2), edge_bends=[1,1.5,1],
-                            label_func=jinvs, size=0.8).shift(2*LEFT)
+        graph = self.make_graph()
         self.add(graph)
+        base = graph.label(0, label_func=self.label, size=0.8)
+        self.add(base)
 
         self.wait()
 
         # Hide labels, fade edges
-        self.play(*(FadeOut(l) for i, l in enumerate(graph.labels) if i not in [0]),
+        self.play(*(FadeOut(l) for l in getattr(graph, 'labels', [])),
                   *(ApplyMethod(e.fade, 0.9) for e in graph.all_edges()))
 
         self.wait()
         
         # Alice path
-        apath, ai = graph.path([2,-1,2], tip=True, stroke_width=5)
-        apath = Group(*apath).shift(2*LEFT)
-        bpath, bi = graph.path([-3,0,2], tip=True, stroke_width=5)
-        bpath = Group(*bpath).shift(2*LEFT)
-        apk = graph.labels[ai]
-        apv = graph.vertices[ai]
-        bpk = graph.labels[bi]
-        bpv = graph.vertices[bi]
-        shk = graph.labels[(ai + bi) % graph.N]
-        shv = graph.vertices[(ai + bi) % graph.N]
+        akey, bkey = (graph.shortest(k) if self.reduce else k for k in self.keys)
+        apath, ai = self.draw_walk(graph, akey)
+        bpath, bi = self.draw_walk(graph, bkey)
+        # The shared curve, reached by both walks in either order
+        si = graph.endpoint(akey, start=bi)
+        apk, bpk, shk = (graph.label(i, label_func=self.label, size=0.8) for i in (ai, bi, si))
+        apv, bpv, shv = (graph.vertices[i] for i in (ai, bi, si))
         alice = Text('Alice', color=DARK_BLUE).next_to(apk, RIGHT)
         bob = Text('Bob', color=DARK_BLUE).next_to(bpk, LEFT)
 
-        #akey = Text('Alice: ', '2', '-1', '2')
-        #bkey = Text('Bob: ', '2', '-1', '2')
-        
         self.play(ShowCreation(apath), run_time=2, rate_func=linear)
         self.play(FadeIn(apk), FadeIn(alice), ScaleInPlace(apv, 2))
         self.wait(1)
@@ -236,14 +346,33 @@ class KeyExchange(Scene):
         self.add(apath.copy().fade(0.7))
         self.add(bpath.copy().fade(0.7))
 
-        self.play(*(Rotating(e, radians=2*PI/graph.N*bi,
-                             about_point=graph.get_center()) for e in apath))
+        centre = graph.vertices[0].get_center() - graph.vertex_pos(0)
+        self.play(Rotating(apath, radians=2*PI/graph.N*bi, about_point=centre))
         self.play(FadeIn(shk), ScaleInPlace(shv, 2))
         self.play(apath.fade, 0.7)
         
-        self.play(*(Rotating(e, radians=2*PI/graph.N*ai,
-                             about_point=graph.get_center()) for e in bpath))
+        self.play(Rotating(bpath, radians=2*PI/graph.N*ai, about_point=centre))
         self.play(bpath.fade, 0.7)
         self.play(FadeToColor(shv, RED))
         
         self.wait()
+
+
+class RandomKeyExchange(KeyExchange):
+    '''
+    Key exchange with random secrets on a graph of 1018 vertices, whose
+    edges and walks are drawn by one VMobject per generator.
+    '''
+    keys = np.random.default_rng(0).integers(-40, 41, size=(2, 3)).tolist()
+    reduce = True
+
+    def label(self, i):
+        return str(i)
+
+    def make_graph(self):
+        graph = CayleyGraph(N=1018, gen=2, radius=3,
+                            edge_dirs=(1,-37,101), edge_bends=[0.5,1,1.5],
+                            label_func=None, bundle=True).shift(2*LEFT)
+        for v in graph.vertices:
+            v.scale(0.25)
+        return graph
@@ -0,0 +1,117 @@
+'''
+Dry runs of scenes: the timeline of a scene without rendering it.
+
+    python dryrun.py module[.Scene] ... [-o timeline.json] [--fps 5]
+
+A dry run executes `construct` with a renderer that never rasterizes or
+encodes.  Animations are still begun, interpolated and finished, so that
+every play starts from the right state.  However, they are stepped at
+`--fps` frames per second, which only affects updaters depending on `dt`.
+Durations come from the animations and are exact.
+'''
+
+import argparse
+import importlib
+import json
+import sys
+from time import perf_counter
+
+from manim import Wait
+
+
+class DryRunRenderer:
+    def __init__(self, frame_rate=5):
+        self.frame_rate = frame_rate
+        self.skip_animations = False
+        self.num_plays = 0
+        self.time = 0
+        self.timeline = []
+
+    def init(self, scene):
+        self.camera = scene.camera_class({}, frame_rate=self.frame_rate)
+        compile_animations = scene.compile_play_args_to_animation_list
+
+        def recorded(*args, **kwargs):
+            self.animations = compile_animations(*args, **kwargs)
+            return self.animations
+
+        scene.compile_play_args_to_animation_list = recorded
+
+    def play(self, scene, *args, **kwargs):
+        self.animations = []
+        start = self.time
+        if args:
+            # As handle_caching_play does, so that mobjects only introduced
+            # by an animation are on the scene and get updated
+            scene.add_mobjects_from_animations(
+                scene.compile_play_args_to_animation_list(*args, **kwargs))
+        scene.play_internal(*args, **kwargs)
+        animations = self.animations
+        if len(animations) == 1 and isinstance(animations[0], Wait):
+            kind = 'wait'
+            if animations[0].stop_condition is None:
+                self.time = start + animations[0].duration
+        else:
+            kind = 'play'
+            self.time = start + scene.get_run_time(animations) if animations else start
+        self.timeline.append({
+            'index': self.num_plays,
+            'kind': kind,
+            'start': start,
+            'duration': self.time - start,
+            'animations': [{'name': str(a), 'run_time': a.run_time} for a in animations],
+            'mobjects': len(scene.get_mobject_family_members()),
+        })
+        self.num_plays += 1
+
+    def update_frame(self, *args, **kwargs):
+        pass
+
+    def get_frame(self):
+        return None
+
+    def add_frame(self, frame, num_frames=1):
+        self.time += num_frames / self.frame_rate
+
+    def finish(self, scene):
+        pass
+
+
+def dry_run(scene_cls, frame_rate=5):
+    '''
+    Run the construct of `scene_cls` and return its timeline.
+    '''
+    t = perf_counter()
+    renderer = DryRunRenderer(frame_rate)
+    scene_cls(renderer=renderer).render()
+    return {
+        'scene': scene_cls.__name__,
+        'duration': renderer.time,
+        'plays': renderer.num_plays,
+        'wall': perf_counter() - t,
+        'timeline': renderer.timeline,
+    }
+
+
+if __name__ == '__main__':
+    from budget import scenes
+    parser = argparse.ArgumentParser(description='Compute scene timelines without rendering.')
+    parser.add_argument('scenes', nargs='+', help='module or module.Scene names')
+    parser.add_argument('-o', '--output', help='write the timelines to this file')
+    parser.add_argument('--fps', type=float, default=5,
+                        help='rate at which animations and updaters are stepped')
+    args = parser.parse_args()
+    names = [s for name in args.scenes
+             for s in ([name] if '.' in name else scenes(name))]
+    timelines = []
+    for name in names:
+        module_name, scene_name = name.rsplit('.', 1)
+        timeline = dry_run(getattr(importlib.import_module(module_name), scene_name), args.fps)
+        print('%-32s %3d plays  %7.2fs  (%.2fs wall)' % (
+            name, timeline['plays'], timeline['duration'], timeline['wall']), file=sys.stderr)
+        timelines.append(timeline)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(timelines, f, indent=1)
+    else:
+        json.dump(timelines, sys.stdout, indent=1)
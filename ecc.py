@@ -1,4 +1,5 @@
 from manim import *
+from field import GFp
 
 class LabeledDot(Dot):
     def __init__(self, label, radius=None, **kwargs) -> None:
@@ -70,6 +71,19 @@ class EC(Mobject):
         y2 = (x - self.a)*(x*x + self.a*x + self.c)
         return np.sqrt(y2) if y2 >= 0 else None
 
+    def points(self, p):
+        '''
+        The affine points of the curve over GF(p), for integers a and c, as
+        arrays of x and y coordinates.
+        '''
+        F = GFp(p)
+        x = F.array(np.arange(p))
+        y2 = F.mul(F.sub(x, self.a), F.add(F.mul(x, F.add(x, self.a)), self.c))
+        square = F.is_square(y2)
+        x, y = x[square], F.sqrt(y2[square])
+        twice = y != 0
+        return np.concatenate([x, x[twice]]), np.concatenate([y, F.neg(y[twice])])
+
     def group_law(self, x0, y0, x1, y1):
         λ = (y0-y1)/(x0-x1)
         x = λ**2 - x0 - x1
@@ -0,0 +1,260 @@
+'''
+Vectorized arithmetic in GF(p) and GF(p²).
+
+Elements of GF(p) are NumPy arrays of residues, elements of GF(p²) =
+GF(p)(√d) arrays whose last axis holds the pair (a, b) standing for
+a + b·√d.  `GFp2` chooses the non-residue `d`, and `isogeny.GF2` takes
+it from there.  Every operation works on whole arrays at once.
+
+Residues are int64 when p < 2³¹, so that products do not overflow, and
+Python integers in object arrays otherwise.  The same code serves both,
+only slower for large p.
+'''
+
+import numpy as np
+
+
+class GFp:
+    '''
+    The prime field GF(p), on arrays.  `mul`, `pow` and `powers` only need
+    `p` to be a modulus; the other operations need it prime.
+    '''
+    def __init__(self, p):
+        self.p = p
+        self.dtype = np.int64 if p < 2**31 else object
+        self._nonresidue = None
+
+    def array(self, x):
+        x = np.asarray(x)
+        if self.dtype is object:
+            x = x.astype(object)
+        return x.astype(self.dtype) % self.p
+
+    def add(self, x, y):
+        return (x + y) % self.p
+
+    def sub(self, x, y):
+        return (x - y) % self.p
+
+    def neg(self, x):
+        return -x % self.p
+
+    def mul(self, x, y):
+        return x * y % self.p
+
+    def pow(self, x, e):
+        '''
+        `x` to the power of the integer `e` >= 0, by square and multiply.
+        '''
+        r = np.ones_like(x) % self.p
+        while e:
+            if e & 1:
+                r = self.mul(r, x)
+            x = self.mul(x, x)
+            e >>= 1
+        return r
+
+    def powers(self, g, n):
+        '''
+        The array [1, g, g², ..., g^(n-1)], in log n steps.
+        '''
+        powers = self.array([1])
+        step = g % self.p
+        while len(powers) < n:
+            powers = np.concatenate([powers, self.mul(powers, step)])
+            step = step * step % self.p
+        return powers[:n]
+
+    def inv(self, x):
+        '''
+        Inverses of the non-zero elements `x`, by Montgomery's trick: the
+        elements are multiplied pairwise up a tree, the root alone is
+        inverted, and inverses are sent back down the tree.
+        '''
+        x = np.asarray(x)
+        if (x == 0).any():
+            raise ZeroDivisionError('inverse of 0 in GF(%d)' % self.p)
+        levels = [x.ravel()]
+        while len(levels[-1]) > 1:
+            level = self._even(levels[-1])
+            levels.append(self.mul(level[0::2], level[1::2]))
+        inverse = self.pow(levels[-1], self.p - 2)
+        for level in reversed(levels[:-1]):
+            even = self._even(level)
+            down = np.empty_like(even)
+            down[0::2] = self.mul(inverse, even[1::2])
+            down[1::2] = self.mul(inverse, even[0::2])
+            inverse = down[:len(level)]
+        return inverse.reshape(x.shape)
+
+    def polyval(self, coefficients, x):
+        '''
+        The polynomial with integer `coefficients`, lowest degree first, at `x`.
+        '''
+        r = np.zeros_like(x)
+        for c in reversed(coefficients):
+            r = self.add(self.mul(r, x), c % self.p)
+        return r
+
+    def _even(self, level):
+        # Pad with a 1 to an even length
+        return np.concatenate([level, self.array([1])]) if len(level) % 2 else level
+
+    @property
+    def nonresidue(self):
+        if self._nonresidue is None:
+            self._nonresidue = next(d for d in range(2, self.p)
+                                    if pow(d, (self.p - 1) // 2, self.p) == self.p - 1)
+        return self._nonresidue
+
+    def legendre(self, x):
+        '''
+        The Legendre symbols of `x`: 0, 1 or -1, as an int array.
+        '''
+        e = self.pow(x, (self.p - 1) // 2)
+        return np.where(e == 0, 0, np.where(e == 1, 1, -1)).astype(np.int64)
+
+    def is_square(self, x):
+        return self.legendre(x) >= 0
+
+    def sqrt(self, x):
+        '''
+        Square roots of the squares `x`, by Tonelli-Shanks run on all the
+        elements at once.
+        '''
+        x = np.asarray(x)
+        if not self.is_square(x).all():
+            raise ValueError('square root of a non-square in GF(%d)' % self.p)
+        p = self.p
+        if p % 4 == 3:
+            return self.pow(x, (p + 1) // 4)
+        q, s = p - 1, 0
+        while q % 2 == 0:
+            q, s = q // 2, s + 1
+        m = np.full(x.shape, s)
+        c = np.full(x.shape, pow(self.nonresidue, q, p), dtype=self.dtype)
+        t = self.pow(x, q)
+        r = self.pow(x, (q + 1) // 2)
+        while True:
+            active = (t != 0) & (t != 1)
+            if not active.any():
+                return r
+            # The least i with t^(2^i) = 1
+            i = np.zeros(x.shape, dtype=np.int64)
+            u = t
+            for k in range(1, s):
+                u = self.mul(u, u)
+                i[(i == 0) & (u == 1)] = k
+            # b = c^(2^(m - i - 1))
+            e = np.where(active, m - i - 1, 0)
+            b = c
+            for k in range(int(e.max())):
+                b = np.where(k < e, self.mul(b, b), b)
+            bb = self.mul(b, b)
+            m = np.where(active, i, m)
+            c = np.where(active, bb, c)
+            t = np.where(active, self.mul(t, bb), t)
+            r = np.where(active, self.mul(r, b), r)
+
+
+class GFp2:
+    '''
+    The field GF(p²) = GF(p)(√d), on arrays of shape (..., 2).
+    '''
+    def __init__(self, p):
+        self.p = p
+        self.base = GFp(p)
+        self.d = -1 if p % 4 == 3 else self.base.nonresidue
+
+    def array(self, a, b=0):
+        a, b = np.broadcast_arrays(self.base.array(a), self.base.array(b))
+        return np.stack([a, b], axis=-1)
+
+    def add(self, x, y):
+        return self.base.add(x, y)
+
+    def sub(self, x, y):
+        return self.base.sub(x, y)
+
+    def neg(self, x):
+        return self.base.neg(x)
+
+    def mul(self, x, y):
+        F = self.base
+        a, b = x[..., 0], x[..., 1]
+        c, e = y[..., 0], y[..., 1]
+        return np.stack([F.add(F.mul(a, c), F.mul(self.d % self.p, F.mul(b, e))),
+                         F.add(F.mul(a, e), F.mul(b, c))], axis=-1)
+
+    def scale(self, x, k):
+        '''
+        `x` times the elements `k` of GF(p).
+        '''
+        return self.base.mul(x, np.asarray(k)[..., None])
+
+    def pow(self, x, e):
+        r = self.array(np.ones(x.shape[:-1], dtype=np.int64))
+        while e:
+            if e & 1:
+                r = self.mul(r, x)
+            x = self.mul(x, x)
+            e >>= 1
+        return r
+
+    def norm(self, x):
+        F = self.base
+        a, b = x[..., 0], x[..., 1]
+        return F.sub(F.mul(a, a), F.mul(self.d % self.p, F.mul(b, b)))
+
+    def inv(self, x):
+        n = self.base.inv(self.norm(x))
+        return np.stack([self.base.mul(x[..., 0], n), self.base.mul(self.base.neg(x[..., 1]), n)],
+                        axis=-1)
+
+    def polyval(self, coefficients, x):
+        '''
+        The polynomial with integer `coefficients`, lowest degree first, at `x`.
+        '''
+        r = np.zeros_like(x)
+        for c in reversed(coefficients):
+            r = self.add(self.mul(r, x), self.array(np.full(x.shape[:-1], c)))
+        return r
+
+    def is_square(self, x):
+        return self.base.is_square(self.norm(x))
+
+    def sqrt(self, x):
+        '''
+        Square roots of the squares `x`.  For a + b√d with b ≠ 0, the root
+        is u + v√d with u² = (a ± √N)/2, N the norm, and v = b/2u.
+        '''
+        F = self.base
+        half = (self.p + 1) // 2
+        a, b = x[..., 0], x[..., 1]
+        u = np.zeros_like(a)
+        v = np.zeros_like(a)
+
+        general = b != 0
+        if general.any():
+            ag, bg = a[general], b[general]
+            n = F.sqrt(self.norm(x[general]))
+            alpha = F.mul(F.add(ag, n), half)
+            # Exactly one of (a + n)/2 and (a - n)/2 is a square
+            flip = ~F.is_square(alpha)
+            alpha[flip] = F.mul(F.sub(ag[flip], n[flip]), half)
+            ug = F.sqrt(alpha)
+            u[general] = ug
+            v[general] = F.mul(bg, F.inv(F.add(ug, ug)))
+
+        # Elements of GF(p): either u or v√d is a root
+        residue = ~general & F.is_square(a)
+        u[residue] = F.sqrt(a[residue])
+        other = ~general & ~residue
+        v[other] = F.sqrt(F.mul(a[other], F.inv(F.array(np.full(other.sum(), self.d)))))
+        return np.stack([u, v], axis=-1)
+
+    def keys(self, x):
+        '''
+        Integers identifying the elements `x`, for sorting and searching.
+        '''
+        return x[..., 0] * self.p + x[..., 1]
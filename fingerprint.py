@@ -0,0 +1,70 @@
+'''
+Cheap content fingerprints for large mobjects.
+
+Before every `play`, the partial-movie cache serialises each mobject on the
+scene to JSON, walking every attribute of every submobject.  Mobjects
+deriving from `Fingerprinted` are hashed instead from their construction
+parameters and a per-member digest of their point buffers; a member is
+only rehashed when its point buffer has been replaced.
+'''
+
+import hashlib
+import numpy as np
+from manim.utils import hashing
+
+STYLE_ATTRS = ('fill_rgbas', 'stroke_rgbas', 'background_stroke_rgbas',
+               'stroke_width', 'background_stroke_width', 'rgbas', 'z_index')
+
+
+def digest(*data):
+    h = hashlib.blake2b(digest_size=16)
+    for d in data:
+        h.update(d if isinstance(d, bytes) else repr(d).encode())
+    return h.digest()
+
+
+class Fingerprinted:
+    _fingerprint_params = b''
+
+    def set_fingerprint_params(self, *params):
+        self._fingerprint_params = digest(*params)
+        self._fingerprint_cache = {}
+        return self
+
+    def invalidate_fingerprint(self):
+        '''
+        Forget cached point digests, for callers modifying points in place.
+        '''
+        self._fingerprint_cache = {}
+        return self
+
+    def fingerprint(self):
+        old = getattr(self, '_fingerprint_cache', {})
+        cache = {}
+        h = hashlib.blake2b(self._fingerprint_params, digest_size=16)
+        for mob in self.get_family():
+            points = mob.points
+            entry = old.get(id(mob))
+            # Point-changing methods assign a new array, so identity is
+            # enough to tell whether the digest is stale.
+            if entry is None or entry[0] is not mob or entry[1] is not points:
+                entry = (mob, points, digest(points.tobytes()))
+            cache[id(mob)] = entry
+            h.update(entry[2])
+            # Colours are updated in place, but these arrays are tiny
+            for attr in STYLE_ATTRS:
+                value = getattr(mob, attr, None)
+                if value is not None:
+                    h.update(np.asarray(value).tobytes())
+        self._fingerprint_cache = cache
+        return h.hexdigest()
+
+
+_default = hashing.CustomEncoder.default
+
+def _default_with_fingerprints(self, obj):
+    if isinstance(obj, Fingerprinted):
+        return {'fingerprint': obj.fingerprint()}
+    return _default(self, obj)
+
+hashing.CustomEncoder.default = _default_with_fingerprints
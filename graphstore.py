@@ -0,0 +1,201 @@
+'''
+Memory-mapped storage of large isogeny graphs.
+
+A graph file holds, after a small JSON header, the adjacency of the graph
+in CSR form, an optional float32 layout and optional j-invariants in
+GF(p²).  The tables are opened with `np.memmap`, so that only the pages
+touched by a query are read: a scene extracting a ball or a path from a
+graph with millions of vertices loads little more than that subgraph.
+
+Layout of a file:
+
+    b'ISOGRAPH', header length (uint64), header (JSON), padding, tables
+
+Vertices are numbered from 0.  `indices[indptr[v]:indptr[v+1]]` are the
+neighbours of `v`, with multiplicity; a loop appears once.  A j-invariant
+`(a, b)` stands for `a + b·√d`, where `d` is the non-residue mod `p` given
+in the header.
+'''
+
+import json
+import numpy as np
+
+MAGIC = b'ISOGRAPH'
+VERSION = 1
+ALIGN = 64
+
+
+def edges_from_lists(adjacency):
+    '''
+    The edges of a graph given as lists of neighbours, like `ssg2`, where
+    each edge is listed once.
+    '''
+    return np.array([(u, v) for u, vs in adjacency.items() for v in vs],
+                    dtype=np.int64).reshape(-1, 2)
+
+
+def write(path, edges, n=None, layout=None, jinvariants=None, p=None, nonresidue=None):
+    '''
+    Store the graph with `edges`, an array of pairs of vertices, in a file.
+    '''
+    edges = np.asarray(edges, dtype=np.int64).reshape(-1, 2)
+    needed = int(edges.max()) + 1 if len(edges) else 0
+    if n is None:
+        n = needed
+    elif n < needed:
+        raise ValueError('edges reach vertex %d of a graph with %d vertices' % (needed - 1, n))
+    if len(edges) and edges.min() < 0:
+        raise ValueError('negative vertex %d' % edges.min())
+    u, v = edges.T
+    other = u != v
+    src = np.concatenate([u, v[other]])
+    dst = np.concatenate([v, u[other]])
+    order = np.argsort(src, kind='stable')
+    indptr = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(np.bincount(src, minlength=n), out=indptr[1:])
+
+    tables = {
+        'indptr': indptr,
+        'indices': dst[order].astype(np.uint32 if n < 2**32 else np.int64),
+    }
+    if layout is not None:
+        tables['layout'] = np.asarray(layout, dtype=np.float32).reshape(n, -1)
+    if jinvariants is not None:
+        tables['jinvariants'] = np.asarray(jinvariants, dtype=np.int64).reshape(n, 2)
+
+    header = {'version': VERSION, 'n': n, 'p': p, 'nonresidue': nonresidue, 'tables': {}}
+    # Offsets depend on the header length, which depends on the offsets
+    # only through their digits: iterate until stable.
+    start = 0
+    while True:
+        offset = start
+        for name, table in tables.items():
+            header['tables'][name] = {'offset': offset, 'dtype': table.dtype.str,
+                                      'shape': table.shape}
+            offset += -(-table.nbytes // ALIGN) * ALIGN
+        blob = json.dumps(header).encode()
+        first = -(-(len(MAGIC) + 8 + len(blob)) // ALIGN) * ALIGN
+        if first == start:
+            break
+        start = first
+
+    with open(path, 'wb') as f:
+        f.write(MAGIC)
+        f.write(np.uint64(len(blob)).tobytes())
+        f.write(blob)
+        for name, table in tables.items():
+            f.seek(header['tables'][name]['offset'])
+            f.write(np.ascontiguousarray(table).tobytes())
+        f.truncate(offset)
+
+
+class GraphStore:
+    def __init__(self, path):
+        self.filename = path
+        with open(path, 'rb') as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                raise ValueError('%s is not a graph file' % path)
+            size = int(np.frombuffer(f.read(8), dtype=np.uint64)[0])
+            self.header = json.loads(f.read(size))
+        if self.header['version'] > VERSION:
+            raise ValueError('%s has unsupported version %d' % (path, self.header['version']))
+        self.n = self.header['n']
+        self.p = self.header['p']
+        self.nonresidue = self.header['nonresidue']
+        for name, table in self.header['tables'].items():
+            setattr(self, name, np.memmap(path, mode='r', dtype=np.dtype(table['dtype']),
+                                          offset=table['offset'], shape=tuple(table['shape'])))
+
+    @property
+    def has_layout(self):
+        return 'layout' in self.header['tables']
+
+    def __len__(self):
+        return self.n
+
+    def neighbors(self, v):
+        return np.asarray(self.indices[self.indptr[v]:self.indptr[v + 1]], dtype=np.int64)
+
+    def expand(self, frontier):
+        '''
+        The neighbours of the vertices of `frontier`, without repetition.
+        '''
+        if not len(frontier):
+            return np.empty(0, dtype=np.int64)
+        return np.unique(np.concatenate([self.neighbors(v) for v in frontier]))
+
+    def ball(self, center, radius):
+        '''
+        The vertices at distance at most `radius` from `center`, in order of
+        distance.
+        '''
+        ball = frontier = np.array([center], dtype=np.int64)
+        for _ in range(radius):
+            frontier = np.setdiff1d(self.expand(frontier), ball)
+            if not len(frontier):
+                break
+            ball = np.concatenate([ball, frontier])
+        return ball
+
+    def path(self, start, end):
+        '''
+        The vertices of a shortest path from `start` to `end`, found by
+        searching from both ends.
+        '''
+        if start == end:
+            return [start]
+        parents = ({start: None}, {end: None})
+        frontiers = ([start], [end])
+        while frontiers[0] and frontiers[1]:
+            side = 0 if len(frontiers[0]) <= len(frontiers[1]) else 1
+            parent, other = parents[side], parents[1 - side]
+            frontier = []
+            for v in frontiers[side]:
+                for w in self.neighbors(v).tolist():
+                    if w in parent:
+                        continue
+                    parent[w] = v
+                    if w in other:
+                        return self._join(parents, w)
+                    frontier.append(w)
+            frontiers = (frontier, frontiers[1]) if side == 0 else (frontiers[0], frontier)
+        raise ValueError('no path from %d to %d' % (start, end))
+
+    @staticmethod
+    def _join(parents, meet):
+        halves = []
+        for parent in parents:
+            half, v = [], meet
+            while v is not None:
+                half.append(v)
+                v = parent[v]
+            halves.append(half)
+        return halves[0][::-1] + halves[1][1:]
+
+    def subgraph(self, vertices):
+        '''
+        The subgraph induced by `vertices`, as lists of neighbours with each
+        edge listed once, like `ssg2`.
+        '''
+        # Sorted, since networkx keeps an edge listed under its earlier end
+        vertices = sorted(int(v) for v in vertices)
+        keep = set(vertices)
+        return {v: [w for w in self.neighbors(v).tolist() if w in keep and w >= v]
+                for v in vertices}
+
+    def sublayout(self, vertices, normalize=True):
+        '''
+        The stored positions of `vertices`, by default centred and scaled to
+        fit the unit ball like a fresh layout.
+        '''
+        vertices = np.asarray(vertices, dtype=np.int64)
+        order = np.argsort(vertices)
+        positions = np.empty((len(vertices), self.layout.shape[1]))
+        positions[order] = self.layout[vertices[order]]
+        if normalize:
+            positions -= positions.mean(axis=0)
+            positions /= max(np.linalg.norm(positions, axis=1).max(), 1e-9)
+        return dict(zip(vertices.tolist(), positions))
+
+    def jinvariant(self, v):
+        return tuple(int(x) for x in self.jinvariants[v])
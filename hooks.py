@@ -0,0 +1,52 @@
+'''
+Opt-in render hooks for the project's scenes.
+
+`install()` wraps `Scene.render`, so that the hooks enabled by environment
+variables are attached to each scene rendered in the process:
+
+    MANIMOGENY_PIPELINE=1   encode frames on a writer thread (see pipeline.py)
+    MANIMOGENY_PROFILE=1    per-play timing report (see profiling.py)
+    MANIMOGENY_MEMORY=1     per-mobject memory report (see memory.py)
+
+Scene modules do not install the hooks themselves; `render.py` does, and
+so does any tool that wants them.  Hook modules are imported only when
+enabled.
+'''
+
+import importlib
+import os
+from manim import Scene
+
+# Attached in this order, so that the profiler times the pipeline's methods
+HOOKS = [
+    ('MANIMOGENY_PIPELINE', 'pipeline', 'Pipeline'),
+    ('MANIMOGENY_PROFILE', 'profiling', 'Profiler'),
+    ('MANIMOGENY_MEMORY', 'memory', 'MemoryReport'),
+]
+
+
+def enabled():
+    return [getattr(importlib.import_module(module), name)
+            for var, module, name in HOOKS if os.environ.get(var)]
+
+
+def attach(scene):
+    return [hook(scene) for hook in enabled()]
+
+
+_render = Scene.render
+
+def render(self):
+    attached = attach(self)
+    try:
+        return _render(self)
+    finally:
+        for hook in reversed(attached):
+            hook.close()
+
+
+def install():
+    '''
+    Attach the enabled hooks to every scene rendered from now on.
+    '''
+    Scene.render = render
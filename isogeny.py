@@ -0,0 +1,328 @@
+'''
+Implicit ℓ-isogeny graphs of supersingular curves.
+
+Supersingular j-invariants live in GF(p²).  Two of them are joined by an
+ℓ-isogeny when they are roots of the modular polynomial Φ_ℓ(X, Y), so the
+neighbours of a curve are the roots of Φ_ℓ(j, Y).  `IsogenyGraph` finds
+these roots on demand, and `search` joins two curves with a bidirectional
+breadth-first search, without ever enumerating the p/12 vertices of the
+graph.  For ℓ = 2, `IsogenyGraph.component` also enumerates a whole
+graph, a breadth-first level at a time, with the array arithmetic of
+field.py.
+'''
+
+import random
+from time import perf_counter
+import numpy as np
+from field import GFp2
+from walks import random_walk
+
+
+def symmetric(coefficients):
+    '''
+    All the coefficients of a symmetric polynomial in X, Y, given those of
+    the monomials X^i Y^k with i >= k.
+    '''
+    full = dict(coefficients)
+    full.update(((k, i), c) for (i, k), c in coefficients.items())
+    return full
+
+
+# Φ_ℓ as {(i, k): coefficient of X^i Y^k}
+MODULAR_POLYNOMIALS = {
+    2: symmetric({
+        (3, 0): 1, (2, 2): -1, (2, 1): 1488, (2, 0): -162000, (1, 1): 40773375,
+        (1, 0): 8748000000, (0, 0): -157464000000000,
+    }),
+    3: symmetric({
+        (4, 0): 1, (3, 3): -1, (3, 2): 2232, (3, 1): -1069956, (3, 0): 36864000,
+        (2, 2): 2587918086, (2, 1): 8900222976000, (2, 0): 452984832000000,
+        (1, 1): -770845966336000000, (1, 0): 1855425871872000000000,
+    }),
+}
+
+
+class GF2:
+    '''
+    The field GF(p²) = GF(p)(√d), for a non-residue d.  Elements are pairs
+    (a, b) standing for a + b√d.  `d` is that of `field.GFp2`, so that
+    elements pass unchanged between the two.
+    '''
+    def __init__(self, p):
+        self.p = p
+        self.d = GFp2(p).d
+        self.zero = (0, 0)
+        self.one = (1, 0)
+
+    def __call__(self, a, b=0):
+        return (a % self.p, b % self.p)
+
+    def add(self, x, y):
+        return ((x[0] + y[0]) % self.p, (x[1] + y[1]) % self.p)
+
+    def sub(self, x, y):
+        return ((x[0] - y[0]) % self.p, (x[1] - y[1]) % self.p)
+
+    def neg(self, x):
+        return (-x[0] % self.p, -x[1] % self.p)
+
+    def mul(self, x, y):
+        a, b = x
+        c, e = y
+        return ((a*c + self.d*b*e) % self.p, (a*e + b*c) % self.p)
+
+    def inv(self, x):
+        a, b = x
+        n = pow(a*a - self.d*b*b, self.p - 2, self.p)
+        return (a*n % self.p, -b*n % self.p)
+
+    def pow(self, x, e):
+        r = self.one
+        while e:
+            if e & 1:
+                r = self.mul(r, x)
+            x = self.mul(x, x)
+            e >>= 1
+        return r
+
+    def random(self, rng):
+        return (rng.randrange(self.p), rng.randrange(self.p))
+
+    # Polynomials are lists of coefficients, lowest degree first, without
+    # trailing zeros.
+
+    def trim(self, f):
+        while f and f[-1] == self.zero:
+            f.pop()
+        return f
+
+    def poly_sub(self, f, g):
+        n = max(len(f), len(g))
+        f = f + [self.zero] * (n - len(f))
+        g = g + [self.zero] * (n - len(g))
+        return self.trim([self.sub(a, b) for a, b in zip(f, g)])
+
+    def poly_mul(self, f, g):
+        if not f or not g:
+            return []
+        h = [self.zero] * (len(f) + len(g) - 1)
+        for i, a in enumerate(f):
+            for k, b in enumerate(g):
+                h[i + k] = self.add(h[i + k], self.mul(a, b))
+        return self.trim(h)
+
+    def poly_divmod(self, f, g):
+        f = list(f)
+        inv = self.inv(g[-1])
+        q = [self.zero] * max(len(f) - len(g) + 1, 0)
+        for i in range(len(f) - len(g), -1, -1):
+            c = self.mul(f[i + len(g) - 1], inv)
+            q[i] = c
+            for k, b in enumerate(g):
+                f[i + k] = self.sub(f[i + k], self.mul(c, b))
+        return self.trim(q), self.trim(f[:len(g) - 1])
+
+    def poly_mod(self, f, g):
+        return self.poly_divmod(f, g)[1]
+
+    def poly_monic(self, f):
+        inv = self.inv(f[-1])
+        return [self.mul(c, inv) for c in f]
+
+    def poly_gcd(self, f, g):
+        while g:
+            f, g = g, self.poly_mod(f, g)
+        return self.poly_monic(f) if f else f
+
+    def poly_powmod(self, f, e, m):
+        r = [self.one]
+        f = self.poly_mod(f, m)
+        while e:
+            if e & 1:
+                r = self.poly_mod(self.poly_mul(r, f), m)
+            f = self.poly_mod(self.poly_mul(f, f), m)
+            e >>= 1
+        return r
+
+    def roots(self, f, rng=None):
+        '''
+        The distinct roots of `f` in GF(p²), in increasing order.
+        '''
+        rng = rng or random.Random(0)
+        q = self.p * self.p
+        x = [self.zero, self.one]
+        # The product of the distinct linear factors of f
+        g = self.poly_gcd(f, self.poly_sub(self.poly_powmod(x, q, f), x))
+        roots = []
+        self._split(g, q, rng, roots)
+        return sorted(roots)
+
+    def _split(self, g, q, rng, roots):
+        # Cantor–Zassenhaus equal-degree splitting, for degree 1
+        if len(g) < 2:
+            return
+        if len(g) == 2:
+            roots.append(self.neg(self.mul(g[0], self.inv(g[1]))))
+            return
+        while True:
+            h = self.poly_powmod([self.random(rng), self.one], (q - 1) // 2, g)
+            h = self.poly_gcd(g, self.poly_sub(h, [self.one]))
+            if 1 < len(h) < len(g):
+                break
+        self._split(h, q, rng, roots)
+        self._split(self.poly_divmod(g, h)[0], q, rng, roots)
+
+
+class IsogenyGraph:
+    '''
+    The ℓ-isogeny graph of supersingular curves over GF(p²), with vertices
+    the j-invariants and neighbours generated on demand.
+    '''
+    def __init__(self, p, ell=2, seed=0):
+        self.p = p
+        self.ell = ell
+        self.field = GF2(p)
+        self.rng = random.Random(seed)
+        # Coefficients of Y^k as polynomials in X, reduced mod p
+        self.coefficients = [[0] * (ell + 2) for _ in range(ell + 2)]
+        for (i, k), c in MODULAR_POLYNOMIALS[ell].items():
+            self.coefficients[k][i] = c % p
+        self.expanded = 0
+
+    def start(self):
+        '''
+        A supersingular j-invariant: 1728 when p = 3 mod 4, 0 when p = 2 mod 3.
+        '''
+        if self.p % 4 == 3:
+            return self.field(1728)
+        if self.p % 3 == 2:
+            return self.field(0)
+        raise ValueError('no known supersingular curve for p = %d' % self.p)
+
+    def polynomial(self, j):
+        '''
+        Φ_ℓ(j, Y) as a polynomial in Y.
+        '''
+        F = self.field
+        powers = [F.one]
+        for _ in range(self.ell + 1):
+            powers.append(F.mul(powers[-1], j))
+        return F.trim([
+            (sum(c * x[0] for c, x in zip(row, powers)) % self.p,
+             sum(c * x[1] for c, x in zip(row, powers)) % self.p)
+            for row in self.coefficients])
+
+    def neighbors(self, j):
+        self.expanded += 1
+        return self.field.roots(self.polynomial(j), self.rng)
+
+    def walk(self, start, steps, seed=0):
+        return random_walk(self.neighbors, start, steps, seed)
+
+    def expand(self, js, parents):
+        '''
+        For ℓ = 2, the neighbours of the curves `js` other than their
+        neighbours `parents`, both arrays of GF(p²) elements, as an array of
+        shape (n, 2, 2).  Φ_2(j, Y) is divided by Y - parent and the
+        remaining quadratic solved, so neighbours keep their multiplicity.
+        '''
+        if self.ell != 2:
+            raise ValueError('batch expansion needs ell = 2, not %d' % self.ell)
+        F = GFp2(self.p)
+        self.expanded += len(js)
+        c0, c1, c2 = (F.polyval(self.coefficients[k], js) for k in range(3))
+        # Y³ + c2 Y² + c1 Y + c0 = (Y - r)(Y² + B Y + C)
+        B = F.add(c2, parents)
+        C = F.add(c1, F.mul(parents, B))
+        root = F.sqrt(F.sub(F.mul(B, B), F.scale(C, 4)))
+        half = (self.p + 1) // 2
+        return np.stack([F.scale(F.sub(root, B), half),
+                         F.scale(F.sub(F.neg(root), B), half)], axis=1)
+
+    def component(self):
+        '''
+        For ℓ = 2, all the vertices reachable from `start()`, numbered in
+        breadth-first order, as an (n, 2) array of j-invariants, and the
+        edges between them, as an array of pairs of vertex numbers.  Each
+        edge is listed once, from its lower-numbered end, with
+        multiplicity; a loop appears once per root.  The result can be
+        stored with `graphstore.write`.
+        '''
+        F = GFp2(self.p)
+        start = self.start()
+        frontier = F.array(*start)[None]
+        parents = F.array(*self.neighbors(start)[0])[None]
+        keys = F.keys(frontier)
+        vertices, sources, targets = [frontier], [], []
+        while len(frontier):
+            neighbors = np.concatenate([parents[:, None], self.expand(frontier, parents)], axis=1)
+            sources.append(np.repeat(F.keys(frontier), 3))
+            targets.append(F.keys(neighbors).ravel())
+            # New vertices, each with the first curve of the frontier reaching it
+            found, first = np.unique(targets[-1], return_index=True)
+            new = ~np.isin(found, keys)
+            frontier = neighbors.reshape(-1, 2)[first[new]]
+            parents = np.repeat(vertices[-1], 3, axis=0)[first[new]]
+            keys = np.concatenate([keys, found[new]])
+            vertices.append(frontier)
+        order = np.argsort(keys)
+        number = lambda k: order[np.searchsorted(keys, k, sorter=order)]
+        u = number(np.concatenate(sources))
+        v = number(np.concatenate(targets))
+        keep = u <= v
+        return np.concatenate(vertices), np.stack([u[keep], v[keep]], axis=1).astype(np.int64)
+
+
+def search(graph, start, end, max_expansions=None):
+    '''
+    A shortest path from `start` to `end`, and statistics of the search.
+
+    The search grows breadth-first trees from both ends, always extending
+    the one with the smaller frontier, until a vertex is reached from
+    both.  Visited vertices are kept in dicts mapping them to their
+    parent, so the trees are also returned, as lists of edges.
+    '''
+    t = perf_counter()
+    expanded = graph.expanded
+    parents = ({start: None}, {end: None})
+    frontiers = ([start], [end])
+    meet = start if start == end else None
+    while meet is None and frontiers[0] and frontiers[1]:
+        side = 0 if len(frontiers[0]) <= len(frontiers[1]) else 1
+        parent, other = parents[side], parents[1 - side]
+        frontier = []
+        for v in frontiers[side]:
+            for w in graph.neighbors(v):
+                if w not in parent:
+                    parent[w] = v
+                    frontier.append(w)
+                    if w in other:
+                        meet = w
+                        break
+            if meet is not None:
+                break
+            if max_expansions and graph.expanded - expanded >= max_expansions:
+                raise RuntimeError('no path found in %d expansions' % max_expansions)
+        frontiers = (frontier, frontiers[1]) if side == 0 else (frontiers[0], frontier)
+    if meet is None:
+        raise ValueError('%s and %s are not connected' % (start, end))
+
+    halves = []
+    for parent in parents:
+        half, v = [], meet
+        while v is not None:
+            half.append(v)
+            v = parent[v]
+        halves.append(half)
+    path = halves[0][::-1] + halves[1][1:]
+    stats = {
+        'p': graph.p,
+        'ell': graph.ell,
+        'length': len(path) - 1,
+        'expanded': graph.expanded - expanded,
+        'visited': len(parents[0]) + len(parents[1]),
+        'seconds': perf_counter() - t,
+        'meet': meet,
+        'trees': [[(u, v) for v, u in parent.items() if u is not None] for parent in parents],
+    }
+    return path, stats
@@ -0,0 +1,147 @@
+'''
+Memory accounting of scene mobject trees.
+
+A `MemoryReport` attached to a scene samples the resident set size on
+every frame.  At the first frame of every play it walks the mobject tree
+and records, per top-level mobject, the number of submobjects and the
+bytes held by point and colour arrays.  An array counts as shared when
+several mobjects reference the same buffer.  It counts as duplicated when
+it holds the same data as another buffer, as left behind by `copy()` and
+`TransformFromCopy`.  The report goes to
+`<media_dir>/profiles/<Scene>.memory.json`.
+'''
+
+import hashlib
+import json
+import os
+import sys
+
+from manim import config
+
+ARRAY_ATTRS = ('points', 'fill_rgbas', 'stroke_rgbas', 'background_stroke_rgbas', 'rgbas')
+
+# ru_maxrss is in kilobytes on Linux, in bytes on macOS
+MAXRSS_UNIT = 1 if sys.platform == 'darwin' else 1024
+
+
+def peak_rss():
+    '''
+    The peak resident set size in bytes, or 0 where `resource` is missing,
+    as on Windows.
+    '''
+    try:
+        import resource
+    except ImportError:
+        return 0
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * MAXRSS_UNIT
+
+
+def rss():
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except OSError:
+        return peak_rss()
+
+
+def buffer(array):
+    '''
+    The array owning the memory of `array`, so that views count once.
+    '''
+    while array.base is not None and hasattr(array.base, 'nbytes'):
+        array = array.base
+    return array
+
+
+def account(mobjects):
+    '''
+    Per-mobject statistics of the trees rooted at `mobjects`.
+    '''
+    seen = {}
+    contents = {}
+    stats = []
+    for i, root in enumerate(mobjects):
+        family = root.get_family()
+        entry = {
+            'index': i,
+            'type': type(root).__name__,
+            'submobjects': len(family) - 1,
+            'points': sum(len(m.points) for m in family),
+            'bytes': 0,
+            'shared_bytes': 0,
+            'duplicated_bytes': 0,
+        }
+        for mob in family:
+            for attr in ARRAY_ATTRS:
+                array = getattr(mob, attr, None)
+                if array is None or not hasattr(array, 'nbytes') or not array.nbytes:
+                    continue
+                owner = buffer(array)
+                if id(owner) in seen:
+                    entry['shared_bytes'] += array.nbytes
+                    continue
+                seen[id(owner)] = owner
+                entry['bytes'] += owner.nbytes
+                key = (owner.nbytes, hashlib.blake2b(owner.tobytes(), digest_size=16).digest())
+                if key in contents:
+                    entry['duplicated_bytes'] += owner.nbytes
+                else:
+                    contents[key] = owner
+        stats.append(entry)
+    return stats
+
+
+class MemoryReport:
+    def __init__(self, scene):
+        self.scene = scene
+        self.plays = []
+        self.sampled = True
+        self.peak = rss()
+
+        renderer = scene.renderer
+        play = renderer.play
+        update_mobjects = scene.update_mobjects
+
+        def sampled_play(*args, **kwargs):
+            self.sampled = False
+            try:
+                return play(*args, **kwargs)
+            finally:
+                # Static waits never update mobjects
+                self.sample()
+
+        def sampled_update(dt):
+            self.sample()
+            return update_mobjects(dt)
+
+        renderer.play = sampled_play
+        scene.update_mobjects = sampled_update
+
+    def sample(self):
+        current = rss()
+        self.peak = max(self.peak, current)
+        if self.sampled:
+            return
+        self.sampled = True
+        mobjects = self.scene.mobjects + self.scene.foreground_mobjects
+        self.plays.append({
+            'index': self.scene.renderer.num_plays,
+            'time': self.scene.renderer.time,
+            'rss': current,
+            'mobjects': account(mobjects),
+        })
+
+    def report(self):
+        largest = max(self.plays, key=lambda p: sum(m['bytes'] for m in p['mobjects']), default=None)
+        return {
+            'scene': str(self.scene),
+            'peak_rss': max(self.peak, peak_rss()),
+            'largest_play': largest and largest['index'],
+            'plays': self.plays,
+        }
+
+    def close(self):
+        path = os.path.join(config.get_dir('media_dir'), 'profiles', '%s.memory.json' % self.scene)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w') as f:
+            json.dump(self.report(), f, indent=1)
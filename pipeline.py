@@ -0,0 +1,124 @@
+'''
+Pipelined frame encoding for scene renders.
+
+By default a frame is rasterized, copied into a new array by `get_frame`,
+and written to ffmpeg's pipe, all on the main thread, so rasterization
+waits for the encoder and the encoder for rasterization.  A `Pipeline`
+attached to a scene copies frames into a pool of reusable buffers instead,
+and hands them to a writer thread through a bounded queue, so that the
+next frame is rasterized while the last ones are written.  A buffer goes
+back to the pool once written, as many times as it was queued.
+
+The queue is drained before each partial movie is closed, and before the
+scene's movie is assembled, so the output is the same frame for frame.
+'''
+
+import queue
+import threading
+import weakref
+from collections import Counter
+
+import numpy as np
+
+# Frames queued ahead of the writer
+DEPTH = 8
+
+
+class Pipeline:
+    def __init__(self, scene, depth=DEPTH):
+        self.renderer = renderer = scene.renderer
+        self.writer = writer = renderer.file_writer
+        self.frames = queue.Queue(maxsize=depth)
+        self.free = queue.SimpleQueue()
+        # Pool buffers by id, forgotten if held on to and dropped, as the
+        # static background of a play is
+        self.pooled = weakref.WeakValueDictionary()
+        self.pending = Counter()
+        self.lock = threading.Lock()
+        self.error = None
+        self.allocated = 0
+
+        self.write_frame = writer.write_frame
+        self.close_movie_pipe = writer.close_movie_pipe
+        self.finish = writer.finish
+        renderer.get_frame = self.get_frame
+        writer.write_frame = self.queue_frame
+        writer.close_movie_pipe = self.drained(self.close_movie_pipe)
+        writer.finish = self.drained(self.finish)
+
+        self.thread = threading.Thread(target=self.run, name='frame-writer', daemon=True)
+        self.thread.start()
+
+    def get_frame(self):
+        '''
+        A copy of the camera's pixel array, in a buffer from the pool.
+        '''
+        pixels = self.renderer.camera.pixel_array
+        try:
+            frame = self.free.get_nowait()
+        except queue.Empty:
+            frame = None
+        if frame is None or frame.shape != pixels.shape:
+            frame = np.empty_like(pixels)
+            self.pooled[id(frame)] = frame
+            self.allocated += 1
+        np.copyto(frame, pixels)
+        return frame
+
+    def queue_frame(self, frame):
+        self.check()
+        with self.lock:
+            self.pending[id(frame)] += 1
+        self.frames.put(frame)
+
+    def run(self):
+        while True:
+            frame = self.frames.get()
+            try:
+                if frame is None:
+                    return
+                if self.error is None:
+                    self.write_frame(frame)
+            except Exception as e:
+                self.error = e
+            finally:
+                if frame is not None:
+                    self.release(frame)
+                self.frames.task_done()
+
+    def release(self, frame):
+        with self.lock:
+            self.pending[id(frame)] -= 1
+            done = not self.pending[id(frame)]
+            if done:
+                del self.pending[id(frame)]
+        if done and self.pooled.get(id(frame)) is frame:
+            self.free.put(frame)
+
+    def check(self):
+        if self.error is not None:
+            error, self.error = self.error, None
+            raise error
+
+    def drain(self):
+        '''
+        Wait for the writer to write every queued frame.
+        '''
+        self.frames.join()
+        self.check()
+
+    def drained(self, func):
+        def drained_func(*args, **kwargs):
+            self.drain()
+            return func(*args, **kwargs)
+        return drained_func
+
+    def close(self):
+        self.frames.join()
+        self.frames.put(None)
+        self.thread.join()
+        self.writer.write_frame = self.write_frame
+        self.writer.close_movie_pipe = self.close_movie_pipe
+        self.writer.finish = self.finish
+        del self.renderer.get_frame
+        self.check()
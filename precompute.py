@@ -0,0 +1,194 @@
+'''
+Graph data computed in the background while a scene renders.
+
+Scenes declare the layouts, paths, cycles, walks and searches they need
+up front.  These are computed in a pool of worker processes, shared by all
+scenes rendered in the process and created on first use.  Jobs are
+submitted when a scene is created, before its camera and file writer are
+set up, and `construct` only blocks when it fetches a result that is not
+ready yet.  Identical jobs of several scenes are computed once.
+
+Graphs are passed to workers as dicts of adjacency lists.  Jobs involving
+randomness take an explicit seed, since workers do not share the random
+state of the scene.  This module does not import manim, and imports
+networkx only in the jobs that use it, so that importing it is cheap and
+spawned workers start quickly.
+'''
+
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from walks import random_walk
+
+
+def layout(graph, dim=3, seed=0):
+    '''
+    A Kamada-Kawai layout, started from a random layout drawn with `seed`.
+    '''
+    import networkx as nx
+    graph = nx.MultiGraph(graph)
+    return nx.kamada_kawai_layout(graph, pos=nx.random_layout(graph, dim=dim, seed=seed),
+                                  dim=dim)
+
+
+def joint_layout(graphs, dim=3, seed=0):
+    '''
+    A Kamada-Kawai layout of the union of `graphs`, on the vertices of the
+    first, started from a random layout drawn with `seed`.
+    '''
+    import networkx as nx
+    union = nx.Graph()
+    union.add_nodes_from(nx.MultiGraph(graphs[0]))
+    for graph in graphs:
+        union.add_edges_from(e[:2] for e in nx.MultiGraph(graph).edges)
+    return nx.kamada_kawai_layout(union, pos=nx.random_layout(union, dim=dim, seed=seed),
+                                  dim=dim)
+
+
+def layer_view(graph, layout, dim=3):
+    '''
+    A Kamada-Kawai layout of `graph` started from `layout`, such as a
+    joint layout.  Vertices of `layout` not in `graph` keep their place.
+    '''
+    import networkx as nx
+    graph = nx.MultiGraph(graph)
+    view = nx.kamada_kawai_layout(graph, pos={n: layout[n] for n in graph}, dim=dim)
+    return {n: view.get(n, position) for n, position in layout.items()}
+
+
+def layer_views(graphs, dim=3, seed=0):
+    '''
+    The joint layout of `graphs`, under None, and the layout of each graph
+    alone started from it, under its index, as `Graph(views=...)` takes.
+    '''
+    joint = joint_layout(graphs, dim, seed)
+    views = {i: layer_view(graph, joint, dim) for i, graph in enumerate(graphs)}
+    return {None: joint, **views}
+
+
+def path(graph, *nodes):
+    '''
+    The vertices of a shortest path through `nodes`, in order.
+    '''
+    import networkx as nx
+    graph = nx.MultiGraph(graph)
+    vertices = [nodes[0]]
+    for start, end in zip(nodes[:-1], nodes[1:]):
+        vertices += nx.shortest_path(graph, start, end)[1:]
+    return vertices
+
+
+def cycle(graph, *nodes):
+    '''
+    A closed walk through `nodes`, a loop when there is only one.
+    '''
+    if len(nodes) == 1:
+        return [nodes[0], nodes[0]]
+    return path(graph, *nodes, nodes[0])
+
+
+def walk(graph, start, steps, seed):
+    import networkx as nx
+    return random_walk(nx.MultiGraph(graph).neighbors, start, steps, seed)
+
+
+def search_trees(p, steps, walk_seed, seed=0, ell=2):
+    '''
+    A shortest path in the ℓ-isogeny graph over GF(p²) from the start
+    curve to the end of a walk of `steps` steps drawn with `walk_seed`,
+    with the search trees as a graph on the curves visited, numbered from
+    0, and a layout of the trees drawn with `seed`.  Returns the path, the
+    search statistics, the numbering, the trees as lists of neighbours
+    and the layout.
+    '''
+    from isogeny import IsogenyGraph, search
+    isogenies = IsogenyGraph(p, ell)
+    start = isogenies.start()
+    end = isogenies.walk(start, steps, seed=walk_seed)[-1]
+    found, stats = search(isogenies, start, end)
+    trees = stats['trees']
+    number = {j: i for i, j in enumerate(dict.fromkeys(
+        [start, end] + [v for tree in trees for u, v in tree]))}
+    adjacency = {i: [] for i in number.values()}
+    for tree in trees:
+        for u, v in tree:
+            # Listed under the earlier vertex, which networkx requires
+            a, b = sorted((number[u], number[v]))
+            adjacency[a].append(b)
+    return found, stats, number, adjacency, layout(adjacency, seed=seed)
+
+
+_executors = {}
+_shared = {}
+
+
+def executor(processes=True):
+    '''
+    The pool shared by all jobs of the process, created on first use.
+    '''
+    if processes not in _executors:
+        _executors[processes] = (ProcessPoolExecutor if processes else ThreadPoolExecutor)()
+    return _executors[processes]
+
+
+def _key(value):
+    # A hashable stand-in for job arguments, which may hold dicts and lists
+    if isinstance(value, dict):
+        return tuple((k, _key(v)) for k, v in value.items())
+    if isinstance(value, (list, tuple)):
+        return tuple(_key(v) for v in value)
+    return value
+
+
+class Jobs:
+    '''
+    Named results computed in the shared worker pool.  Scenes submitting
+    the same job with the same arguments share its result.
+    '''
+    def __init__(self, processes=True, seed=0):
+        self.processes = processes
+        self.seed = seed
+        self.futures = {}
+        self.calls = {}
+
+    def submit(self, name, func, *args, **kwargs):
+        key = (self.processes, func, _key(args), _key(kwargs))
+        if key not in _shared or _shared[key].cancelled():
+            _shared[key] = executor(self.processes).submit(func, *args, **kwargs)
+        self.futures[name] = _shared[key]
+        self.calls[name] = (func, args, kwargs)
+        return self.futures[name]
+
+    def layout(self, name, graph, dim=3):
+        return self.submit(name, layout, graph, dim, self.seed)
+
+    def joint_layout(self, name, graphs, dim=3):
+        return self.submit(name, joint_layout, graphs, dim, self.seed)
+
+    def layer_views(self, name, graphs, dim=3):
+        return self.submit(name, layer_views, graphs, dim, self.seed)
+
+    def path(self, name, graph, *nodes):
+        return self.submit(name, path, graph, *nodes)
+
+    def cycle(self, name, graph, *nodes):
+        return self.submit(name, cycle, graph, *nodes)
+
+    def walk(self, name, graph, start, steps, seed=None):
+        return self.submit(name, walk, graph, start, steps,
+                           self.seed if seed is None else seed)
+
+    def search_trees(self, name, p, steps, walk_seed, ell=2):
+        return self.submit(name, search_trees, p, steps, walk_seed, self.seed, ell)
+
+    def __getitem__(self, name):
+        if self.futures[name].cancelled():
+            # Cancelled by another scene sharing the job
+            func, args, kwargs = self.calls[name]
+            self.submit(name, func, *args, **kwargs)
+        return self.futures[name].result()
+
+    def cancel(self):
+        '''
+        Cancel the jobs not started yet.  The pool stays up for other scenes.
+        '''
+        for future in self.futures.values():
+            future.cancel()
@@ -0,0 +1,128 @@
+'''
+Per-play timing of scene renders.
+
+A `Profiler` attached to a scene times every `play` and `wait`, split by
+phase, and records the number of mobjects and points on the scene.  When
+the scene is rendered, it writes a JSON report to
+`<media_dir>/profiles/<Scene>.json`.  The report is also a Chrome trace
+(its `traceEvents` key), which chrome://tracing, Perfetto and speedscope
+display as a flame graph.
+
+Phases are measured by wrapping a handful of methods per play and per
+frame, so the overhead is a few timer calls per frame.
+'''
+
+import json
+import os
+from collections import defaultdict
+from time import perf_counter
+
+from manim import Wait, config
+from manim.utils import caching
+
+PHASES = ('construct', 'hashing', 'updaters', 'rasterize', 'encode', 'animate')
+
+
+class Profiler:
+    def __init__(self, scene):
+        self.scene = scene
+        self.plays = []
+        self.phases = None
+        self.start = self.last = perf_counter()
+        self.patched = []
+
+        renderer = scene.renderer
+        self.wrap(renderer, 'play', self.timed_play)
+        self.wrap(scene, 'update_mobjects', self.timed('updaters'))
+        self.wrap(renderer, 'update_frame', self.timed('rasterize'))
+        self.wrap(renderer, 'get_frame', self.timed('rasterize'))
+        self.wrap(renderer, 'add_frame', self.counted(self.timed('encode')))
+        self.wrap(caching, 'get_hash_from_play_call', self.timed('hashing'), restore=True)
+
+    def wrap(self, obj, name, wrapper, restore=False):
+        func = getattr(obj, name)
+        setattr(obj, name, wrapper(func))
+        if restore:
+            self.patched.append((obj, name, func))
+
+    def timed(self, phase):
+        def wrapper(func):
+            def timed_func(*args, **kwargs):
+                if self.phases is None:
+                    return func(*args, **kwargs)
+                t = perf_counter()
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    self.phases[phase] += perf_counter() - t
+            return timed_func
+        return wrapper
+
+    def counted(self, wrapper):
+        def counted_wrapper(func):
+            timed_func = wrapper(func)
+            def counted_func(frame, num_frames=1):
+                if self.phases is not None:
+                    self.phases['frames'] += num_frames
+                return timed_func(frame, num_frames)
+            return counted_func
+        return counted_wrapper
+
+    def timed_play(self, play):
+        def timed_func(scene, *args, **kwargs):
+            t = perf_counter()
+            self.phases = phases = defaultdict(float)
+            phases['construct'] = t - self.last
+            try:
+                return play(scene, *args, **kwargs)
+            finally:
+                self.last = end = perf_counter()
+                self.phases = None
+                phases['animate'] = (end - t) - sum(phases[p] for p in PHASES[1:-1])
+                family = scene.get_mobject_family_members()
+                self.plays.append({
+                    'index': len(self.plays),
+                    'kind': 'wait' if args and isinstance(args[0], Wait) else 'play',
+                    'animations': [str(a) for a in args],
+                    'start': t - self.start,
+                    'wall': end - t,
+                    'phases': {p: phases[p] for p in PHASES},
+                    'frames': int(phases['frames']),
+                    'mobjects': len(family),
+                    'points': sum(len(m.points) for m in family),
+                })
+        return timed_func
+
+    def report(self):
+        end = perf_counter()
+        totals = {p: sum(play['phases'][p] for play in self.plays) for p in PHASES}
+        totals['construct'] += end - self.last
+        events = []
+        for play in self.plays:
+            name = '%s %d' % (play['kind'], play['index'])
+            ts = play['start'] - play['phases']['construct']
+            events.append(self.event(name, ts, play['wall'] + play['phases']['construct'],
+                                     animations=play['animations']))
+            for phase in PHASES:
+                events.append(self.event(phase, ts, play['phases'][phase]))
+                ts += play['phases'][phase]
+        return {
+            'scene': str(self.scene),
+            'wall': end - self.start,
+            'phases': totals,
+            'plays': self.plays,
+            'traceEvents': events,
+            'displayTimeUnit': 'ms',
+        }
+
+    def event(self, name, ts, dur, **args):
+        return {'name': name, 'ph': 'X', 'pid': 0, 'tid': 0,
+                'ts': ts * 1e6, 'dur': dur * 1e6, 'args': args}
+
+    def close(self):
+        for obj, name, func in self.patched:
+            setattr(obj, name, func)
+        path = os.path.join(config.get_dir('media_dir'), 'profiles', '%s.json' % self.scene)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w') as f:
+            json.dump(self.report(), f, indent=1)
@@ -0,0 +1,12 @@
+'''
+The manim command line, with the render hooks of hooks.py installed:
+
+    MANIMOGENY_PROFILE=1 python render.py supersingular.py SSGraph -ql
+'''
+
+from manim.__main__ import main
+import hooks
+
+if __name__ == '__main__':
+    hooks.install()
+    main()
@@ -0,0 +1,31 @@
+'''
+The supersingular isogeny graphs drawn by the scenes.
+
+`ssg2` and `ssg3` are the graphs of 2- and 3-isogenies on the same 87
+supersingular curves, as lists of neighbours with each edge listed once,
+under its lower end.  They are kept in graphstore files under data/ and
+read on first access, so that importing a scene module, or starting a
+worker, does not build them.
+'''
+
+import os
+from functools import lru_cache
+
+DATA = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data')
+GRAPHS = ('ssg2', 'ssg3')
+
+
+@lru_cache(maxsize=None)
+def load(name):
+    '''
+    The graph stored in data/<name>.bin, as lists of neighbours.
+    '''
+    from graphstore import GraphStore
+    store = GraphStore(os.path.join(DATA, '%s.bin' % name))
+    return store.subgraph(range(len(store)))
+
+
+def __getattr__(name):
+    if name in GRAPHS:
+        return load(name)
+    raise AttributeError('module %r has no attribute %r' % (__name__, name))
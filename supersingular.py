@@ -1,8 +1,12 @@
-import networkx as nx
 from manim import *
+from fingerprint import Fingerprinted, digest
+from walks import seeded_walk
+from precompute import Jobs, joint_layout, layer_view
+from volcano import Volcano
+import ssg
 from itertools import cycle, zip_longest
-import random
-random.seed()
+from collections import defaultdict
+from collections.abc import Sequence
 
 class LabeledDot(Dot):
     def __init__(self, label, radius=None, **kwargs) -> None:
@@ -20,31 +24,280 @@ class LabeledDot(Dot):
         self.add(rendered_label)
 
 
-class Graph(Mobject):
-    def __init__(self, graphs, vertex_color=RED, edge_colors=[BLACK], scale=5, **kwargs):
+class EdgeLayers(Sequence):
+    '''
+    The edge mobjects of each layer of a Graph, built on first access.
+    '''
+    def __init__(self, graph):
+        self.graph = graph
+        self.built = {}
+        self.ends = {}
+
+    def __len__(self):
+        return len(self.graph.graphs)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[k] for k in range(len(self))[i]]
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError(i)
+        if i not in self.built:
+            kwargs = self.graph._edge_kwargs[i]
+            edges = list(self.graph.graphs[i].edges)
+            self.ends[i] = np.array([(self.graph.index[n], self.graph.index[e])
+                                     for n, e, _ in edges], dtype=int).reshape(-1, 2)
+            if self.graph.bundle:
+                self.built[i] = [self.graph.bundle_edges(self.ends[i], **kwargs)]
+            else:
+                self.built[i] = [self.graph.edge(n, e, **kwargs) for n, e, _ in edges]
+        return self.built[i]
+
+    def curve_ends(self, i):
+        '''
+        The mobjects of layer `i`, each with the ends of each of its curves.
+        '''
+        if self.graph.bundle:
+            return [(self[i][0], self.ends[i])]
+        return [(m, self.ends[i][k:k + 1]) for k, m in enumerate(self[i])]
+
+
+# Points of an edge drawn from vertex a to vertex b are w·a + (1 - w)·b,
+# plus an offset for loops
+BUNDLE_WEIGHTS = np.array([1, 2/3, 1/3, 0])
+LOOP_OFFSETS = np.array([[0, 0, 0], [1, 1, 1], [-1, 1, -1], [0, 0, 0]])
+
+
+class Graph(Fingerprinted, Mobject):
+    '''
+    A 3D drawing of one or more layers of edges on a common vertex set.
+
+    Vertex and edge mobjects are only built when first accessed, or when
+    the graph itself is drawn.  Only the layers listed in `layers` are
+    part of the graph as a mobject; the others are still available
+    through `edges`.  Like those returned by `vertex` and `path`, mobjects
+    built after the graph has been moved are placed from the layout.
+
+    Vertex tessellation follows `lod`: 'auto' picks the resolution of
+    spheres from their radius, the render size and the perspective
+    magnification of the vertex that can come nearest to the camera, so
+    that all spheres of a radius get the same resolution whatever their
+    depth.  'preview' draws flat discs facing the camera, and an integer
+    fixes the resolution.  By default, renders at 480p or below use
+    'preview'.
+
+    A `layout` computed beforehand, e.g. by `precompute.layout` or
+    `precompute.joint_layout`, saves laying out the first layer.  With
+    `joint`, the layout is that of the union of all layers, so that none
+    of them looks tangled, and `view` gives the layout of each layer
+    alone, for `LayerMorph`.  `views` from `precompute.layer_views` saves
+    computing all of these.  With `bundle`, the edges of each layer are
+    drawn by a single VMobject.  `labels` draws names beside vertices.
+    '''
+    def __init__(self, graphs, vertex_color=RED, edge_colors=[BLACK], scale=5,
+                 layers=None, lod=None, layout=None, joint=False, bundle=False, views=None,
+                 **kwargs):
+        import networkx as nx
+        self._pending = False
         super().__init__(**kwargs)
-        self.edges = []
         self.graphs = [nx.MultiGraph(g) for g in graphs]
-        self.layout = nx.kamada_kawai_layout(self.graphs[0], dim=3)
+        views = dict(views or {})
+        if layout is None:
+            layout = views.get(None) or (joint_layout(self.graphs) if joint
+                                         else nx.kamada_kawai_layout(self.graphs[0], dim=3))
+        self.layout = layout
+        self._views = {**views, None: layout}
+        self.bundle = bundle
         self._scale = scale
-
-        self.vertices = [self.vertex(n, fill_color=vertex_color, **kwargs)
-                         for n in self.graphs[0].nodes]
-        self.add(*self.vertices)
-
-        for g, col in zip(self.graphs, cycle(edge_colors)):
-            self.edges.append([])
-            for n, e, _ in g.edges:
-                self.edges[-1].append(self.edge(n, e, color=col, **kwargs))
-            self.add(*self.edges[-1])
+        self.lod = lod if lod is not None else (
+            'preview' if config['pixel_height'] <= 480 else 'auto')
+        # Vertices nearest to the camera are magnified by d / (d - z)
+        distance = ThreeDCamera.CONFIG['distance']
+        extent = scale * max(np.linalg.norm(p) for p in self.layout.values())
+        self._pixels_per_unit = (config['pixel_width'] / config['frame_width']
+                                 * distance / max(distance - extent, 1))
+        self.set_fingerprint_params([sorted(g.edges) for g in self.graphs],
+                                    vertex_color, edge_colors, scale, self.lod, bundle, kwargs)
+
+        self._vertex_kwargs = dict(kwargs, fill_color=vertex_color)
+        self._edge_kwargs = [dict(kwargs, color=col)
+                             for g, col in zip(self.graphs, cycle(edge_colors))]
+        self._vertices = None
+
+        # Per-vertex attributes, pushed to the vertex meshes in bulk
+        self.nodes = list(self.graphs[0].nodes)
+        self.index = {n: i for i, n in enumerate(self.nodes)}
+        self._default_rgba = color_to_rgba(vertex_color,
+                                           self._vertex_kwargs.get('fill_opacity', 1))
+        self._default_radius = self._vertex_kwargs.get('radius', 0.1)
+        self.vertex_rgbas = np.tile(self._default_rgba, (len(self.index), 1))
+        self.vertex_radii = np.full(len(self.index), self._default_radius)
+        self.edges = EdgeLayers(self)
+        self.show_vertices = True
+        self.layers = list(range(len(self.graphs))) if layers is None else list(layers)
+        self._pending = True
+
+    @classmethod
+    def from_store(cls, store, vertices, **kwargs):
+        '''
+        The subgraph of a `graphstore.GraphStore` induced by `vertices`, such
+        as a ball or a path, placed by the stored layout if there is one.
+        '''
+        layout = store.sublayout(vertices) if store.has_layout else None
+        return cls([store.subgraph(vertices)], layout=layout, **kwargs)
+
+    @property
+    def submobjects(self):
+        if self._pending:
+            self._pending = False
+            shown = self.vertices if self.show_vertices else []
+            for i in self.layers:
+                shown = shown + self.edges[i]
+            self._submobjects = list_update(self._submobjects, shown)
+        return self._submobjects
+
+    @submobjects.setter
+    def submobjects(self, submobjects):
+        self._submobjects = submobjects
+
+    @property
+    def vertices(self):
+        if self._vertices is None:
+            self._vertices = [self.vertex(n, **self._vertex_kwargs)
+                              for n in self.nodes]
+            self._mesh_radii = np.full(len(self.index), self._default_radius)
+            self.update_vertices(range(len(self.index)))
+        return self._vertices
+
+    def vertex_resolution(self, radius):
+        if self.lod == 'preview':
+            return 0
+        if self.lod == 'auto':
+            return sphere_resolution(radius * self._pixels_per_unit)
+        return self.lod
+
+    def refresh_lod(self, indices):
+        '''
+        Rebuild the meshes of vertices whose radius now calls for another
+        resolution.
+        '''
+        if self._vertices is None or self.lod != 'auto':
+            return self
+        for i in indices:
+            old = self._vertices[i]
+            resolution = self.vertex_resolution(self.vertex_radii[i])
+            if resolution == old.resolution:
+                continue
+            new = self.vertex(self.nodes[i], **dict(self._vertex_kwargs, radius=self.vertex_radii[i],
+                                        resolution=resolution))
+            new.move_to(old.get_center())
+            self._vertices[i] = new
+            self._submobjects = [new if m is old else m for m in self._submobjects]
+            self._mesh_radii[i] = self.vertex_radii[i]
+        return self.update_vertices(indices)
+
+    def graph_hash(self, layer=0):
+        return digest(sorted(self.graphs[layer].edges)).hex()
+
+    def indices(self, vertices):
+        return np.array([self.index[n] for n in vertices], dtype=int)
+
+    def update_vertices(self, indices):
+        '''
+        Push the attribute arrays to the meshes of the vertices at `indices`,
+        one mesh at a time.
+        '''
+        if self._vertices is None:
+            return self
+        for i in indices:
+            mesh = self._vertices[i]
+            if self.vertex_radii[i] != self._mesh_radii[i]:
+                mesh.scale(self.vertex_radii[i] / self._mesh_radii[i])
+                self._mesh_radii[i] = self.vertex_radii[i]
+            for m in mesh.get_family():
+                m.fill_rgbas[:] = self.vertex_rgbas[i]
+        return self
+
+    def set_vertices(self, vertices, color=None, radius=None, opacity=None):
+        idx = self.indices(vertices)
+        if color is not None:
+            self.vertex_rgbas[idx, :3] = color_to_rgb(color)
+        if opacity is not None:
+            self.vertex_rgbas[idx, 3] = opacity
+        if radius is not None:
+            self.vertex_radii[idx] = radius
+        return self.update_vertices(idx)
+
+    def highlight(self, vertices, color=None, radius=None, opacity=None, **kwargs):
+        return AnimateVertices(self, vertices, color, radius, opacity, **kwargs)
+
+    def unhighlight(self, vertices, **kwargs):
+        return AnimateVertices(self, vertices, rgba_to_color(self._default_rgba),
+                               self._default_radius, self._default_rgba[3], **kwargs)
+
+    def show(self, *layers, vertices=True):
+        '''
+        Make layers (and vertices) part of the graph again after `release`.
+        '''
+        self.layers += [i for i in layers if i not in self.layers]
+        self.show_vertices = self.show_vertices or vertices
+        self._pending = True
+        return self
+
+    def release(self, *layers, vertices=False):
+        '''
+        Drop the mobjects of some layers (and of the vertices), removing
+        them from the graph.  They are rebuilt if accessed again.
+        '''
+        dropped = []
+        for i in layers:
+            dropped += self.edges.built.pop(i, [])
+            if i in self.layers:
+                self.layers.remove(i)
+        if vertices:
+            dropped += self._vertices or []
+            self._vertices = None
+            self.show_vertices = False
+        ids = set(map(id, dropped))
+        self._submobjects = [m for m in self._submobjects if id(m) not in ids]
+        return self
+
+    def view(self, layer=None):
+        '''
+        The layout of `layer` alone, found by Kamada-Kawai started from the
+        layout of the graph, or the layout of the graph for None.
+        '''
+        if layer not in self._views:
+            self._views[layer] = layer_view(self.graphs[layer], self._views[None])
+        return self._views[layer]
+
+    def positions(self, layout=None):
+        '''
+        The positions of the vertices under `layout`, by default the
+        current one, as an array in the order of `nodes`.
+        '''
+        layout = self.layout if layout is None else layout
+        return self._scale * np.array([layout[n] for n in self.nodes])
+
+    def bundle_edges(self, ends, **kwargs):
+        '''
+        One VMobject drawing the edges between the vertex indices `ends`,
+        like `edge` does.
+        '''
+        positions = self.positions()
+        points = (BUNDLE_WEIGHTS[None, :, None] * positions[ends[:, 0], None]
+                  + (1 - BUNDLE_WEIGHTS)[None, :, None] * positions[ends[:, 1], None])
+        points[ends[:, 0] == ends[:, 1]] += LOOP_OFFSETS
+        return VMobject(**kwargs).set_points(points.reshape(-1, 3))
 
     def vertex(self, n, **kwargs):
         defaults = dict(
             radius=0.1,
-            resolution=5,
             color=RED,
         )
         defaults.update(kwargs)
+        defaults.setdefault('resolution', self.vertex_resolution(defaults['radius']))
         return SimpleSphere(**defaults).move_to(self._scale*self.layout[n])
 
     def edge(self, start, end, **kwargs):
@@ -60,24 +313,311 @@ class Graph(Mobject):
                         **kwargs)
     
     def path(self, start, end, graph=0, **kwargs):
-        path = nx.shortest_path(self.graphs[graph], start, end)
+        import networkx as nx
+        return self.along(nx.shortest_path(self.graphs[graph], start, end), **kwargs)
+
+    def along(self, vertices, **kwargs):
+        '''
+        The edges of a walk through `vertices`, such as a precomputed path.
+        '''
         return [self.edge(prev, next, **kwargs)
-                for prev, next in zip(path[:-1], path[1:])]
+                for prev, next in zip(vertices[:-1], vertices[1:])]
 
     def cycle(self, start, mid1, mid2, **kwargs):
         return (self.path(start, mid1, **kwargs)
                 + self.path(mid1, mid2, **kwargs)
                 + self.path(mid2, start, **kwargs))
 
+    def labels(self, vertices, labels=None, direction=UP, buff=SMALL_BUFF, **kwargs):
+        '''
+        `Labels` beside `vertices`, by default their names, `buff` away
+        from the vertex spheres on screen.
+        '''
+        idx = self.indices(vertices)
+        labels = [str(n) for n in vertices] if labels is None else labels
+        return Labels(self.positions()[idx], labels, direction=direction,
+                      buff=buff + self.vertex_radii[idx], **kwargs)
+
+class AnimateVertices(Animation):
+    '''
+    Interpolate the colour, radius and opacity of a set of vertices of a
+    Graph.  The per-vertex arrays are interpolated in one operation per
+    frame, then pushed to the meshes of these vertices only.
+    '''
+    def __init__(self, graph, vertices, color=None, radius=None, opacity=None,
+                 **kwargs):
+        super().__init__(graph, **kwargs)
+        self.idx = graph.indices(vertices)
+        self.color = color
+        self.radius = radius
+        self.opacity = opacity
+
+    def create_starting_mobject(self):
+        # The starting state is kept as arrays, no need to copy the graph
+        return self.mobject
+
+    def begin(self):
+        graph = self.mobject
+        self.start_rgbas = graph.vertex_rgbas[self.idx]
+        self.start_radii = graph.vertex_radii[self.idx]
+        self.end_rgbas = self.start_rgbas.copy()
+        self.end_radii = self.start_radii.copy()
+        if self.color is not None:
+            self.end_rgbas[:, :3] = color_to_rgb(self.color)
+        if self.opacity is not None:
+            self.end_rgbas[:, 3] = self.opacity
+        if self.radius is not None:
+            self.end_radii[:] = self.radius
+        super().begin()
+
+    def finish(self):
+        super().finish()
+        self.mobject.refresh_lod(self.idx)
+
+    def get_all_mobjects(self):
+        return self.mobject,
+
+    def interpolate_mobject(self, alpha):
+        graph = self.mobject
+        graph.vertex_rgbas[self.idx] = interpolate(self.start_rgbas, self.end_rgbas, alpha)
+        graph.vertex_radii[self.idx] = interpolate(self.start_radii, self.end_radii, alpha)
+        graph.update_vertices(self.idx)
+
+
+class LayerMorph(Animation):
+    '''
+    Switch a Graph to showing the edges of `layers`, moving the vertices to
+    the layout of `view` (see `Graph.view`).  Layers coming in fade in,
+    layers going out fade out and are released at the end.
+
+    Vertex positions and layer opacities are interpolated as arrays.  Each
+    frame moves every vertex mesh by its displacement, and recomputes the
+    points of each edge mobject from the displacements of its ends, which
+    is one array operation per layer when layers are bundled.
+    '''
+    def __init__(self, graph, layers, view=None, **kwargs):
+        super().__init__(graph, **kwargs)
+        self.layers = list(layers)
+        self.view = view
+
+    def create_starting_mobject(self):
+        return self.mobject
+
+    def get_all_mobjects(self):
+        return self.mobject,
+
+    def begin(self):
+        graph = self.mobject
+        self.start = graph.positions()
+        self.end = graph.positions(graph.view(self.view))
+        if graph.show_vertices:
+            # Built now, so that they move with the rest
+            graph.vertices
+        self.placed = self.start
+        self.leaving = [i for i in graph.layers if i not in self.layers]
+        self.edges = []
+        for i in set(graph.layers + self.layers):
+            coming = i not in graph.layers
+            for mob, ends in graph.edges.curve_ends(i):
+                opacity = mob.get_stroke_opacity()
+                self.edges.append((mob, mob.points.copy(), np.repeat(ends, 4, axis=0),
+                                   0 if coming else opacity,
+                                   0 if i in self.leaving else opacity))
+        graph.show(*self.layers, vertices=False)
+        super().begin()
+
+    def interpolate_mobject(self, alpha):
+        graph = self.mobject
+        positions = interpolate(self.start, self.end, alpha)
+        if graph._vertices is not None:
+            for mesh, shift in zip(graph._vertices, positions - self.placed):
+                mesh.shift(shift)
+        self.placed = positions
+        moved = positions - self.start
+        for mob, points, ends, start, end in self.edges:
+            w = np.resize(BUNDLE_WEIGHTS, len(points))[:, None]
+            mob.set_points(points + w * moved[ends[:, 0]] + (1 - w) * moved[ends[:, 1]])
+            mob.set_stroke(opacity=interpolate(start, end, alpha))
+
+    def finish(self):
+        super().finish()
+        graph = self.mobject
+        graph.layout = graph.view(self.view)
+        self.dropped = [m for i in self.leaving for m in graph.edges[i]]
+        graph.release(*self.leaving)
+
+    def clean_up_from_scene(self, scene):
+        super().clean_up_from_scene(scene)
+        # Released edges may also have been added to the scene directly
+        scene.remove(*self.dropped)
+
+
+def sphere_resolution(radius, tolerance=1):
+    '''
+    The smallest SimpleSphere resolution whose silhouette stays within
+    `tolerance` pixels of a sphere of `radius` pixels, or 0 when a flat
+    disc will do.
+    '''
+    if radius <= 2*tolerance:
+        return 0
+    return min(16, int(np.ceil(PI / (2*np.arccos(1 - tolerance/radius)))))
+
+
 class SimpleSphere(Dot):
+    '''
+    A sphere drawn as discs turned around two axes, `resolution` distinct
+    orientations per axis.  With resolution 0 it is a flat disc, which
+    `BillboardCamera` keeps facing the camera.
+    '''
     def __init__(self, resolution=20, **kwargs):
         super().__init__(**kwargs)
+        self.resolution = resolution
+        self.billboard = resolution == 0
         for i in range(resolution):
-            self.add(Dot(**kwargs).rotate(2*PI/resolution*i + PI/resolution, LEFT))
-            self.add(Dot(**kwargs).rotate(2*PI/resolution*i + PI/resolution, UP))
+            self.add(Dot(**kwargs).rotate(PI/resolution*i + PI/resolution/2, LEFT))
+            self.add(Dot(**kwargs).rotate(PI/resolution*i + PI/resolution/2, UP))
+
+
+# Sprites of string labels, by text, style and pixel density
+_sprites = {}
+
+
+class Labels(Fingerprinted, AbstractImageMobject):
+    '''
+    Labels at the points `anchors`, always facing the camera.
+
+    Each label, a string drawn by Text or any mobject, is rasterized once,
+    at the pixel density of the render, into a sprite.  `BillboardCamera` then
+    projects all anchors at once and blends the sprites there, so labels
+    cost no path drawing per frame.  Each sprite is placed `buff` away
+    from its anchor in `direction` on screen, and is not scaled by depth,
+    like mobjects added by `add_fixed_orientation_mobjects`.
+
+    The anchors are the points of the mobject, so labels move with
+    `shift` and the like; `fade` and `set_opacity` act on all labels.
+    '''
+    def __init__(self, anchors, labels, direction=ORIGIN, buff=SMALL_BUFF, color=BLACK,
+                 **kwargs):
+        super().__init__(scale_to_resolution=None, **kwargs)
+        self.points = np.array(anchors, dtype=float).reshape(-1, 3)
+        self.opacities = np.ones(len(self.points))
+        ppu = config['pixel_width'] / config['frame_width']
+        self.sprites = [self.rasterize(label, color, ppu) for label in labels]
+
+        # Offset of each sprite centre from its anchor, in pixels, y down
+        sizes = np.array([s.shape[1::-1] for s in self.sprites]).reshape(-1, 2)
+        direction = np.asarray(direction)[:2] * [1, -1]
+        gap = np.broadcast_to(buff, len(sizes))[:, None] * ppu
+        self.offsets = (direction * (gap + np.abs(direction) * sizes / 2)).round().astype(int)
+        self.set_fingerprint_params([s.tobytes() for s in self.sprites],
+                                    self.offsets.tobytes())
+
+    @staticmethod
+    def rasterize(label, color, ppu):
+        '''
+        The premultiplied RGBA sprite of `label`, cached for strings.
+        '''
+        key = (label, color, ppu) if isinstance(label, str) else None
+        if key in _sprites:
+            return _sprites[key]
+        mob = Text(label, color=color) if isinstance(label, str) else label.copy()
+        mob.move_to(ORIGIN)
+        width, height = (int(np.ceil(x * ppu)) + 2 for x in (mob.get_width(), mob.get_height()))
+        camera = Camera({}, pixel_width=width, pixel_height=height,
+                        frame_width=width / ppu, frame_height=height / ppu,
+                        background_color=BLACK, background_opacity=0)
+        camera.capture_mobject(mob)
+        sprite = camera.pixel_array.copy()
+        if key is not None:
+            _sprites[key] = sprite
+        return sprite
+
+    def reset_points(self):
+        Mobject.reset_points(self)
+
+    def get_pixel_array(self):
+        return self.sprites[0] if self.sprites else np.zeros((1, 1, 4), np.uint8)
+
+    def set_opacity(self, opacity):
+        self.opacities[:] = opacity
+        return self
+
+    def fade(self, darkness=0.5, family=True):
+        self.opacities *= 1 - darkness
+        return self
+
+    def interpolate_color(self, mobject1, mobject2, alpha):
+        self.opacities = interpolate(mobject1.opacities, mobject2.opacities, alpha)
+
+    def fingerprint(self):
+        return digest(super().fingerprint(), self.opacities.tobytes()).hex()
+
+
+class BillboardCamera(ThreeDCamera):
+    '''
+    A ThreeDCamera keeping mobjects marked `billboard` facing it, and
+    drawing `Labels` by blending their sprites.
+
+    Billboards are recognised by their attribute rather than registered
+    with `add_fixed_orientation_mobjects`, so they add nothing to the
+    camera state hashed on every play, and meshes replaced or released
+    by a Graph leave nothing behind.
+    '''
+    def transform_points_pre_display(self, mobject, points):
+        if not getattr(mobject, 'billboard', False):
+            return super().transform_points_pre_display(mobject, points)
+        points = Camera.transform_points_pre_display(self, mobject, points)
+        center = mobject.get_center()
+        return points + (self.project_point(center) - center)
+
+    def display_multiple_image_mobjects(self, image_mobjects, pixel_array):
+        for mob in image_mobjects:
+            if isinstance(mob, Labels):
+                self.display_labels(mob, pixel_array)
+            else:
+                self.display_image_mobject(mob, pixel_array)
+
+    def display_labels(self, labels, pixel_array):
+        if not len(labels.points):
+            return
+        height, width = pixel_array.shape[:2]
+        centers = self.points_to_pixel_coords(labels, labels.points) + labels.offsets
+        for sprite, (x, y), opacity in zip(labels.sprites, centers, labels.opacities):
+            h, w = sprite.shape[:2]
+            x0, y0 = x - w // 2, y - h // 2
+            # Clip to the frame
+            sx, sy = max(0, -x0), max(0, -y0)
+            ex, ey = min(w, width - x0), min(h, height - y0)
+            if opacity <= 0 or sx >= ex or sy >= ey:
+                continue
+            src = sprite[sy:ey, sx:ex] * opacity
+            dst = pixel_array[y0 + sy:y0 + ey, x0 + sx:x0 + ex]
+            # Porter-Duff over, as cairo composes premultiplied colours
+            dst[:] = src + dst * (1 - src[..., 3:] / 255)
 
 
 class Rotating3DScene(ThreeDScene):
+    CONFIG = {
+        'camera_class': BillboardCamera,
+    }
+
+    def __init__(self, **kwargs):
+        # Submitted before the camera and file writer are set up, with the
+        # seed of the scene, since workers do not share its random state
+        digest_config(self, kwargs)
+        self.jobs = Jobs(seed=self.random_seed)
+        self.precompute(self.jobs)
+        super().__init__(**kwargs)
+
+    def precompute(self, jobs):
+        '''
+        Submit the graph data that `construct` will need to `jobs`.
+        '''
+
+    def tear_down(self):
+        self.jobs.cancel()
+        super().tear_down()
+
     def begin_ambient_camera_rotation(self, γ=0, φ=0, θ=0.02):
         for tracker, α in zip([self.renderer.camera.gamma_tracker,
                                self.renderer.camera.phi_tracker,
@@ -95,7 +635,7 @@ class Rotating3DScene(ThreeDScene):
     
 class SSGraph(Rotating3DScene):
     def construct(self):
-        graph = Graph([ssg2])
+        graph = Graph([ssg.ssg2])
         for e in graph.edges:
             self.add(*e)
         self.add(*graph.vertices)
@@ -105,7 +645,7 @@ class SSGraph(Rotating3DScene):
 
 class SSGraph2(Rotating3DScene):
     def construct(self):
-        graph = Graph([ssg2], scale=3).shift(0.5*DOWN)
+        graph = Graph([ssg.ssg2], scale=3).shift(0.5*DOWN)
         for e in graph.edges:
             self.add(*e)
         self.add(*graph.vertices)
@@ -117,8 +657,12 @@ class SSGraph2(Rotating3DScene):
 
 
 class GraphConstruct(Rotating3DScene):
+    def precompute(self, jobs):
+        jobs.layer_views('views', [ssg.ssg2, ssg.ssg3])
+
     def construct(self):
-        graph = Graph([ssg2, ssg3], edge_colors=[DARK_BLUE, ORANGE])
+        graph = Graph([ssg.ssg2, ssg.ssg3], edge_colors=[DARK_BLUE, ORANGE],
+                      views=self.jobs['views'], bundle=True, layers=[0])
 
         self.begin_ambient_camera_rotation(0.111, 0.057, 0.049)
         self.play(
@@ -132,23 +676,21 @@ class GraphConstruct(Rotating3DScene):
         self.play(*(ShowCreation(e) for e in graph.edges[0]), run_time=3)
 
         self.wait(3)
-        
-        self.play(*(FadeOut(e, run_time=1) for e in graph.edges[0]),
-                  *(ShowCreation(e, run_time=3) for e in graph.edges[1]))
+
+        # Each layer untangles in its own layout
+        self.play(LayerMorph(graph, [1], view=1), run_time=3)
 
         self.wait(3)
 
-        self.play(*(FadeOut(e) for e in graph.edges[1]),
-                  *(FadeIn(e)  for e in graph.edges[0]))
+        self.play(LayerMorph(graph, [0], view=0))
 
         self.wait(1)
         
-        self.play(*(FadeOut(e) for e in graph.edges[0]),
-                  *(FadeIn(e)  for e in graph.edges[1]))
+        self.play(LayerMorph(graph, [1], view=1))
 
         self.wait(1)
         
-        self.play(*(FadeIn(e)  for e in graph.edges[0]))
+        self.play(LayerMorph(graph, [0, 1]))
 
         self.wait()
 
@@ -156,8 +698,16 @@ class GraphConstruct(Rotating3DScene):
 
 
 class PathFinding(Rotating3DScene):
+    def precompute(self, jobs):
+        jobs.layout('layout', ssg.ssg2)
+        jobs.path('walk', ssg.ssg2, 1, 15)
+        jobs.path('short', ssg.ssg2, 1, 21)
+        jobs.cycle('cycle', ssg.ssg2, 1, 34, 82)
+        jobs.path('alternate', ssg.ssg2, 1, 3, 15)
+
     def construct(self):
-        graph = Graph([ssg2], edge_colors=[LIGHT_GRAY], opacity=0.5)
+        graph = Graph([ssg.ssg2], edge_colors=[LIGHT_GRAY], opacity=0.5,
+                      layout=self.jobs['layout'])
 
         self.begin_ambient_camera_rotation(0.111, 0.057, 0.049)
         self.play(FadeIn(graph))
@@ -165,43 +715,37 @@ class PathFinding(Rotating3DScene):
         self.wait(19)
 
         # Isogeny walk problem
-        start = graph.vertex(1, fill_color=DARK_BLUE, radius=0.3, resolution=10)
-        end = graph.vertex(15, fill_color=DARK_BLUE, radius=0.3, resolution=10)
-        self.play(TransformFromCopy(graph.vertices[1], start),
-                  TransformFromCopy(graph.vertices[15], end))
+        self.play(graph.highlight([1, 15], DARK_BLUE, radius=0.3))
 
         self.wait(8)
 
-        path = graph.path(1, 15, color=BLACK, stroke_width=8)
+        path = graph.along(self.jobs['walk'], color=BLACK, stroke_width=8)
         for e in path:
             self.play(ShowCreation(e))
 
         self.wait(18)
 
         # Undo walk
-        self.play(Transform(end, graph.vertices[15]), *(FadeOut(e) for e in path))
+        self.play(graph.unhighlight([15]), *(FadeOut(e) for e in path))
 
         self.wait()
 
         # Short walk
-        path = graph.path(1, 21, color=BLACK, stroke_width=8)
+        path = graph.along(self.jobs['short'], color=BLACK, stroke_width=8)
         for e in path:
             self.play(ShowCreation(e))
 
-        end = graph.vertex(21, fill_color=DARK_BLUE, radius=0.3, resolution=10)
-        self.play(TransformFromCopy(graph.vertices[21], end))
+        self.play(graph.highlight([21], DARK_BLUE, radius=0.3))
 
         self.wait(50)
 
         # Undo walk
-        self.play(Transform(end, graph.vertices[21]), *(FadeOut(e) for e in path))
+        self.play(graph.unhighlight([21]), *(FadeOut(e) for e in path))
 
         self.wait()
 
         # Cycle
-        path = (graph.path(1, 34, color=BLACK, stroke_width=8)
-                + graph.path(34, 82, color=BLACK, stroke_width=8)
-                + graph.path(82, 1, color=BLACK, stroke_width=8))
+        path = graph.along(self.jobs['cycle'], color=BLACK, stroke_width=8)
         for e in path:
             self.play(ShowCreation(e))
 
@@ -213,12 +757,10 @@ class PathFinding(Rotating3DScene):
         self.wait()
         
         # Alternate path
-        end = graph.vertex(15, fill_color=DARK_BLUE, radius=0.3, resolution=10)
-        path = graph.path(1, 15, color=BLACK, stroke_width=8)
-        altp = (graph.path(1, 3, color=DARK_BLUE, stroke_width=8)
-                + graph.path(3, 15, color=DARK_BLUE, stroke_width=8))
+        path = graph.along(self.jobs['walk'], color=BLACK, stroke_width=8)
+        altp = graph.along(self.jobs['alternate'], color=DARK_BLUE, stroke_width=8)
 
-        self.play(TransformFromCopy(graph.vertices[15], end), *(FadeIn(e) for e in path))
+        self.play(graph.highlight([15], DARK_BLUE, radius=0.3), *(FadeIn(e) for e in path))
 
         self.wait()
 
@@ -231,8 +773,25 @@ class PathFinding(Rotating3DScene):
 
 
 class Cycles(Rotating3DScene):
+    cycles = [
+        ((1, 34, 82), BLUE),
+        ((51, 70, 33), RED),
+        ((20,), BLACK),
+        ((68, 73, 70), LIGHT_BROWN),
+        ((38, 31, 83), GREEN),
+        ((45, 71, 85), PURPLE),
+        ((23, 15, 67), DARK_BLUE),
+        ((19, 6, 31), TEAL),
+    ]
+
+    def precompute(self, jobs):
+        jobs.layout('layout', ssg.ssg2)
+        for i, (nodes, color) in enumerate(self.cycles):
+            jobs.cycle(i, ssg.ssg2, *nodes)
+
     def construct(self):
-        graph = Graph([ssg2], edge_colors=[LIGHT_GRAY], opacity=0.5)
+        graph = Graph([ssg.ssg2], edge_colors=[LIGHT_GRAY], opacity=0.5,
+                      layout=self.jobs['layout'])
 
         self.begin_ambient_camera_rotation(0.111, 0.057, 0.049)
         
@@ -240,16 +799,8 @@ class Cycles(Rotating3DScene):
 
         self.wait()
 
-        cycles = [
-            Group(*graph.cycle(1, 34, 82, color=BLUE, stroke_width=8)),
-            Group(*graph.cycle(51, 70, 33, color=RED, stroke_width=8)),
-            Group(graph.edge(20, 20, color=BLACK, stroke_width=8)),
-            Group(*graph.cycle(68, 73, 70, color=LIGHT_BROWN, stroke_width=8)),
-            Group(*graph.cycle(38, 31, 83, color=GREEN, stroke_width=8)),
-            Group(*graph.cycle(45, 71, 85, color=PURPLE, stroke_width=8)),
-            Group(*graph.cycle(23, 15, 67, color=DARK_BLUE, stroke_width=8)),
-            Group(*graph.cycle(19, 6, 31, color=TEAL, stroke_width=8)),
-        ]
+        cycles = [Group(*graph.along(self.jobs[i], color=color, stroke_width=8))
+                  for i, (nodes, color) in enumerate(self.cycles)]
 
         for c in cycles:
             f = c.copy()
@@ -266,7 +817,7 @@ class Cycles(Rotating3DScene):
 
 class SIDH(Rotating3DScene):
     def construct(self):
-        graph = Graph([ssg2], edge_colors=[LIGHT_GRAY], opacity=0.5)
+        graph = Graph([ssg.ssg2], edge_colors=[LIGHT_GRAY], opacity=0.5)
 
         self.begin_ambient_camera_rotation(0.111, 0.057, 0.049)
         
@@ -274,32 +825,34 @@ class SIDH(Rotating3DScene):
 
         self.wait()
         
-        start = graph.vertex(1, fill_color=BLUE, radius=0.2, resolution=10)
-        self.play(Transform(graph.vertices[1], start))
+        self.play(graph.highlight([1], BLUE, radius=0.2))
         alice = graph.path(1, 15, color=DARK_BLUE, stroke_width=8)
         bob = graph.path(1, 50, color=GREEN, stroke_width=8)
-        enda = graph.vertex(15, fill_color=BLUE, radius=0.2, resolution=10)
-        endb = graph.vertex(50, fill_color=BLUE, radius=0.2, resolution=10)
         for es in zip_longest(alice, bob):
             self.play(*(ShowCreation(e) for e in es if e is not None))
-        self.play(Transform(graph.vertices[15], enda),
-                  Transform(graph.vertices[50], endb))
+        self.play(graph.highlight([15, 50], BLUE, radius=0.2))
         self.wait()
 
-        atxt = LabeledDot(Text('??', color=DARK_BLUE)).scale(1.5).next_to(enda, UP)
-        btxt = LabeledDot(Text('??', color=RED)).scale(1.5).next_to(endb, UP)
-        atxt.fade(0.9)
-        btxt.fade(0.9)
-        self.add_fixed_orientation_mobjects(atxt, btxt)
-        self.play(ApplyMethod(atxt.fade, -9), ApplyMethod(btxt.fade, -9))
+        secrets = graph.labels([15, 50], [LabeledDot(Text('??', color=DARK_BLUE)).scale(1.5),
+                                          LabeledDot(Text('??', color=RED)).scale(1.5)])
+        secrets.fade(0.9)
+        self.add(secrets)
+        self.play(ApplyMethod(secrets.fade, -9))
         self.wait(20)
         
         self.stop_ambient_camera_rotation()
 
 
 class Hashing(Rotating3DScene):
+    def precompute(self, jobs):
+        jobs.layout('layout', ssg.ssg2)
+        jobs.cycle('loop3', ssg.ssg2, 38, 31, 83)
+        jobs.path('walk', ssg.ssg2, 20, 15)
+        jobs.cycle('cycle', ssg.ssg2, 15, 83, 21)
+
     def construct(self):
-        graph = Graph([ssg2], edge_colors=[LIGHT_GRAY], opacity=0.5)
+        graph = Graph([ssg.ssg2], edge_colors=[LIGHT_GRAY], opacity=0.5,
+                      layout=self.jobs['layout'])
 
         self.set_camera_orientation(phi=75 * DEGREES, theta=-45 * DEGREES)
         
@@ -309,41 +862,30 @@ class Hashing(Rotating3DScene):
 
         self.wait()
 
-        j1728 = graph.vertex(20, fill_color=BLUE, radius=0.2, resolution=10)
         l1728 = graph.edge(20, 20, color=BLUE, stroke_width=8)
-        j0 = graph.vertex(26, fill_color=ORANGE, radius=0.2, resolution=10)
         l0 = graph.edge(26, 26, color=ORANGE, stroke_width=8)
-        j38 = graph.vertex(38, fill_color=GREEN, radius=0.2, resolution=10)
-        j31 = graph.vertex(31, fill_color=GREEN, radius=0.2, resolution=10)
-        j83 = graph.vertex(83, fill_color=GREEN, radius=0.2, resolution=10)
-        loop3 = graph.cycle(38, 31, 83, color=GREEN, stroke_width=8)
-        self.play(TransformFromCopy(graph.vertices[20], j1728))
+        loop3 = graph.along(self.jobs['loop3'], color=GREEN, stroke_width=8)
+        self.play(graph.highlight([20], BLUE, radius=0.2))
         self.play(ShowCreation(l1728))
-        self.play(TransformFromCopy(graph.vertices[26], j0))
+        self.play(graph.highlight([26], ORANGE, radius=0.2))
         self.play(ShowCreation(l0))
-        self.play(TransformFromCopy(graph.vertices[38], j38),
-                  TransformFromCopy(graph.vertices[31], j31),
-                  TransformFromCopy(graph.vertices[83], j83))
+        self.play(graph.highlight([38, 31, 83], GREEN, radius=0.2))
         for e in loop3:
             self.play(ShowCreation(e))
         self.wait(15)
 
-        self.play(FadeOut(l1728),
-                  Transform(j0, graph.vertices[26]), FadeOut(l0),
-                  Transform(j38, graph.vertices[38]),
-                  Transform(j31, graph.vertices[31]),
-                  Transform(j83, graph.vertices[83]),
+        self.play(FadeOut(l1728), FadeOut(l0),
+                  graph.unhighlight([26, 38, 31, 83]),
                   *(FadeOut(e) for e in loop3))
         self.wait()
 
-        walk = graph.path(20, 15, color=DARK_BLUE, stroke_width=8)
-        end = graph.vertex(15, fill_color=RED, radius=0.2, resolution=10)
+        walk = graph.along(self.jobs['walk'], color=DARK_BLUE, stroke_width=8)
         for e in walk:
             self.play(ShowCreation(e))
-        self.play(TransformFromCopy(graph.vertices[15], end))
+        self.play(graph.highlight([15], RED, radius=0.2))
         self.wait(2)
         
-        cycle = Group(*graph.cycle(15, 83, 21, color=ORANGE, stroke_width=8))
+        cycle = Group(*graph.along(self.jobs['cycle'], color=ORANGE, stroke_width=8))
         f = cycle.copy()
         f.set_color(WHITE)
         self.play(FadeIn(cycle), ShowPassingFlash(f))
@@ -357,14 +899,106 @@ class Hashing(Rotating3DScene):
         self.play(*(FadeOut(e) for e in walk))
         self.wait(25)
         
-        self.play(Transform(j1728, graph.vertices[20]))
+        self.play(graph.unhighlight([20]))
         self.wait(40)
         
         self.stop_ambient_camera_rotation()
 
+class ImplicitPathFinding(Rotating3DScene):
+    '''
+    A shortest path between two curves, in a graph of about p/12 vertices
+    that is never enumerated: only the two search trees are drawn.
+    '''
+    p = 1000003
+
+    def precompute(self, jobs):
+        jobs.search_trees('search', self.p, 30, walk_seed=3)
+
+    def construct(self):
+        path, stats, number, adjacency, layout = self.jobs['search']
+        trees = stats['trees']
+        start, end = path[0], path[-1]
+        graph = Graph([adjacency], layers=[], scale=3, layout=layout)
+
+        # The meet vertex is reached by both trees: its vertex is shown
+        # once, at the depth of the first, and both edges to it are drawn
+        depth = {start: 0, end: 0}
+        levels = defaultdict(list)
+        for side, tree in enumerate(trees):
+            for u, v in tree:
+                new = v not in depth
+                if new:
+                    depth[v] = depth[u] + 1
+                levels[depth[u] + 1].append(
+                    (number[u], number[v], (DARK_BLUE, GREEN)[side], new))
+
+        self.begin_ambient_camera_rotation(0.111, 0.057, 0.049)
+        self.play(FadeIn(graph.vertex(number[start], color=DARK_BLUE, radius=0.18)),
+                  FadeIn(graph.vertex(number[end], color=GREEN, radius=0.18)))
+        self.wait()
+
+        for d in sorted(levels):
+            self.play(*(ShowCreation(graph.edge(u, v, color=color, stroke_width=2))
+                        for u, v, color, new in levels[d]),
+                      *(FadeIn(graph.vertex(v, color=color, radius=0.06))
+                        for u, v, color, new in levels[d] if new),
+                      run_time=0.5)
+        self.wait()
+
+        walk = [number[j] for j in path]
+        for e in graph.along(walk, color=BLACK, stroke_width=8):
+            self.play(ShowCreation(e), run_time=0.3)
+
+        summary = Text('p = %d:  %d curves expanded,  path of length %d' % (
+            stats['p'], stats['expanded'], stats['length']), color=BLACK).scale(0.5).to_edge(DOWN)
+        self.add_fixed_in_frame_mobjects(summary)
+        self.play(FadeIn(summary))
+        self.wait(10)
+
+        self.stop_ambient_camera_rotation()
+
+
+class OrdinaryVolcano(Rotating3DScene):
+    '''
+    The 2-volcano of an ordinary curve: a crater of 25 curves, and five
+    levels below it, built from the crater down.
+    '''
+    p = 122849
+    j = 105331
+
+    def construct(self):
+        volcano = Volcano(self.p, self.j)
+        graph = Graph([volcano.lists()], layout=volcano.layout(), layers=[], scale=3)
+        colors = color_gradient([RED, DARK_BLUE], volcano.height + 1)
+        depth = volcano.depth
+
+        self.begin_ambient_camera_rotation(0.111, 0.057, 0.049)
+        self.play(*(FadeIn(graph.vertex(v, color=colors[0], radius=0.08))
+                    for v in volcano.crater),
+                  *(ShowCreation(graph.edge(a, b, color=colors[0], stroke_width=4))
+                    for a, b in volcano.edges.tolist() if depth[a] == depth[b] == 0 and a != b))
+        self.wait()
+
+        for d in range(1, volcano.height + 1):
+            level = np.flatnonzero(depth == d)
+            self.play(*(ShowCreation(graph.edge(volcano.parent[v], v, color=colors[d],
+                                                stroke_width=2)) for v in level),
+                      *(FadeIn(graph.vertex(v, color=colors[d], radius=0.05)) for v in level))
+        self.wait()
+
+        summary = Text('p = %d,  trace %d:  crater of %d curves,  height %d' % (
+            volcano.p, volcano.trace, len(volcano.crater), volcano.height),
+                       color=BLACK).scale(0.5).to_edge(DOWN)
+        self.add_fixed_in_frame_mobjects(summary)
+        self.play(FadeIn(summary))
+        self.wait(10)
+
+        self.stop_ambient_camera_rotation()
+
+
 class RandomWalk(Rotating3DScene):
     def construct(self):
-        graph = Graph([ssg2], edge_colors=[LIGHT_GRAY], opacity=0.5, scale=3, radius=0.06)
+        graph = Graph([ssg.ssg2], edge_colors=[LIGHT_GRAY], opacity=0.5, scale=3, radius=0.06)
 
         self.begin_ambient_camera_rotation(0.111, 0.057, 0.049)
         self.play(FadeIn(graph))
@@ -372,195 +1006,10 @@ class RandomWalk(Rotating3DScene):
         self.wait(1)
 
         # Start a random walk
-        prev, cur = None, 1
-        start = graph.vertex(cur, fill_color=DARK_BLUE, radius=0.18, resolution=8)
-        self.play(Transform(graph.vertices[cur], start))
-
-        for i in range(80):
-            neighbors = list(graph.graphs[0].neighbors(cur))
-            try:
-                neighbors.remove(prev)
-            except:
-                pass
-            next = random.choice(neighbors) if neighbors else prev
+        walk = seeded_walk(graph, 1, 80, seed=0)
+        self.play(graph.highlight(walk[:1], DARK_BLUE, radius=0.18))
+
+        for cur, next in zip(walk[:-1], walk[1:]):
             e = graph.edge(cur, next, color=BLACK, stroke_width=6)
             self.play(ShowCreation(e))
-            prev, cur = cur, next
-
-
-
-ssg2 = {0: [14],
-  1: [25, 39, 82],
-  2: [9, 42, 79],
-  3: [30, 51, 70],
-  4: [22, 43, 78],
-  5: [28, 46, 75],
-  6: [15, 22, 24],
-  7: [12, 40, 81],
-  8: [24, 55, 66],
-  9: [21, 24],
-  10: [15, 27],
-  11: [12, 17, 29],
-  12: [25],
-  13: [26, 44, 77],
-  14: [16, 22],
-  15: [],
-  16: [23, 28],
-  17: [37, 84],
-  18: [21, 26, 34],
-  19: [21, 57, 64],
-  20: [20, 30],
-  21: [],
-  22: [],
-  23: [36, 85],
-  24: [],
-  25: [28],
-  26: [26],
-  27: [29, 32],
-  28: [],
-  29: [33],
-  30: [32],
-  31: [32, 38, 83],
-  32: [],
-  33: [43, 78],
-  34: [39, 82],
-  35: [48, 65, 76],
-  36: [65, 74],
-  37: [61, 69],
-  38: [54, 83],
-  39: [41],
-  40: [48, 53],
-  41: [60, 72],
-  42: [51, 59],
-  43: [63],
-  44: [66, 75],
-  45: [67, 75, 86],
-  46: [76, 77],
-  47: [69, 74, 85],
-  48: [59],
-  49: [56, 62, 80],
-  50: [52, 53, 64],
-  51: [58],
-  52: [74, 84],
-  53: [58],
-  54: [64, 76],
-  55: [61, 77],
-  56: [85, 86],
-  57: [67, 71],
-  58: [78],
-  59: [72],
-  60: [66, 84],
-  61: [80],
-  62: [73, 79],
-  63: [68, 70],
-  64: [],
-  65: [72],
-  66: [],
-  67: [83],
-  68: [71, 81],
-  69: [71],
-  70: [79],
-  71: [],
-  72: [],
-  73: [81, 86],
-  74: [],
-  75: [],
-  76: [],
-  77: [],
-  78: [],
-  79: [],
-  80: [82],
-  81: [],
-  82: [],
-  83: [],
-  84: [],
-  85: [],
-  86: []}
-
-ssg3 = {0: [0, 17],
-  1: [5, 8, 58, 63],
-  2: [3, 7, 60, 61],
-  3: [34, 50, 71],
-  4: [23, 33, 41, 80],
-  5: [15, 57, 64],
-  6: [27, 28, 55, 66],
-  7: [7, 23],
-  8: [24, 31],
-  9: [12, 30, 55, 66],
-  10: [13, 15, 46, 75],
-  11: [14, 21, 48, 73],
-  12: [16, 40, 81],
-  13: [18, 31],
-  14: [14, 37, 84],
-  15: [44, 77],
-  16: [22, 52, 69],
-  17: [19, 59, 62],
-  18: [29, 30],
-  19: [20, 46, 75],
-  20: [21],
-  21: [44, 77],
-  22: [29, 60, 61],
-  23: [47, 74],
-  24: [25, 32],
-  25: [28, 53, 68],
-  26: [26, 27, 32],
-  27: [45, 76],
-  28: [50, 71],
-  29: [35, 86],
-  30: [57, 64],
-  31: [38, 83],
-  32: [54, 67],
-  33: [34, 56, 65],
-  34: [44, 77],
-  35: [49, 71, 86],
-  36: [47, 78, 81, 85],
-  37: [64, 72, 79],
-  38: [44, 55, 83],
-  39: [55, 70, 75, 78],
-  40: [79, 81, 85],
-  41: [45, 61, 79],
-  42: [70, 80, 81, 84],
-  43: [72, 78, 82, 85],
-  44: [],
-  45: [64, 76],
-  46: [67, 82],
-  47: [53, 63],
-  48: [56, 62, 68],
-  49: [59, 78, 84],
-  50: [69, 86],
-  51: [52, 68, 79, 82],
-  52: [56, 71],
-  53: [70, 73],
-  54: [61, 67, 75],
-  55: [],
-  56: [65],
-  57: [76, 84],
-  58: [62, 63, 74],
-  59: [63, 73],
-  60: [67, 80],
-  61: [],
-  62: [72],
-  63: [],
-  64: [],
-  65: [69, 73],
-  66: [82, 83],
-  67: [],
-  68: [74],
-  69: [70],
-  70: [],
-  71: [],
-  72: [86],
-  73: [],
-  74: [85],
-  75: [],
-  76: [80],
-  77: [83],
-  78: [],
-  79: [],
-  80: [],
-  81: [],
-  82: [],
-  83: [],
-  84: [],
-  85: [],
-  86: []}
+
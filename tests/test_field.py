@@ -0,0 +1,36 @@
+import numpy as np
+import pytest
+
+from field import GFp, GFp2
+
+
+# p = 3 mod 4, p = 1 mod 2⁹, and a prime needing object arrays
+PRIMES = [10007, 7681, 2**61 - 1]
+
+
+@pytest.mark.parametrize('p', PRIMES)
+def test_prime_field(p):
+    F = GFp(p)
+    x = F.array(np.random.default_rng(0).integers(1, min(p, 2**62), 1001))
+    assert (F.mul(F.inv(x), x) == 1).all()
+    squares = F.mul(x, x)
+    roots = F.sqrt(squares)
+    assert (F.mul(roots, roots) == squares).all()
+    assert F.legendre(squares).tolist() == [1] * len(x)
+    assert F.legendre(F.mul(squares, F.nonresidue)).tolist() == [-1] * len(x)
+    assert F.powers(3, 5).tolist() == [pow(3, i, p) for i in range(5)]
+    with pytest.raises(ValueError):
+        F.sqrt(F.array([F.nonresidue]))
+
+
+@pytest.mark.parametrize('p', PRIMES)
+def test_quadratic_field(p):
+    F = GFp2(p)
+    rng = np.random.default_rng(1)
+    x = F.array(rng.integers(1, min(p, 2**62), 500), rng.integers(0, min(p, 2**62), 500))
+    x[:50, 1] = 0
+    assert (F.mul(F.inv(x), x) == F.array(1)).all()
+    for squares in (F.mul(x, x), x[:50]):
+        roots = F.sqrt(squares)
+        assert (F.mul(roots, roots) == squares).all()
+
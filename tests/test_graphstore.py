@@ -0,0 +1,45 @@
+from collections import Counter
+
+import networkx as nx
+import numpy as np
+import pytest
+
+from graphstore import GraphStore, write
+
+
+def random_multigraph(n, m, seed):
+    rng = np.random.default_rng(seed)
+    graph = nx.MultiGraph()
+    graph.add_nodes_from(range(n))
+    graph.add_edges_from(rng.integers(0, n, size=(m, 2)).tolist())
+    return graph
+
+
+def test_round_trip_matches_networkx(tmp_path):
+    graph = random_multigraph(300, 700, seed=0)
+    layout = np.random.default_rng(1).random((300, 3))
+    write(tmp_path / 'g.bin', list(graph.edges()), n=300, layout=layout, p=1009)
+    store = GraphStore(tmp_path / 'g.bin')
+    assert len(store) == 300 and store.p == 1009
+    for v in graph:
+        expected = Counter(w for w, keys in graph[v].items() for _ in keys)
+        assert Counter(store.neighbors(v).tolist()) == expected
+    assert np.allclose(store.layout, layout.astype(np.float32))
+
+    vertices = store.ball(5, 2)[::-1]
+    sub = nx.MultiGraph(store.subgraph(vertices))
+    assert Counter(map(frozenset, sub.edges())) == \
+        Counter(map(frozenset, graph.subgraph(vertices.tolist()).edges()))
+
+    component = max(nx.connected_components(graph), key=len)
+    a, b = sorted(component)[:2]
+    path = store.path(a, b)
+    assert len(path) == nx.shortest_path_length(graph, a, b) + 1
+    assert all(graph.has_edge(u, v) for u, v in zip(path, path[1:]))
+
+
+def test_write_checks_vertex_count(tmp_path):
+    write(tmp_path / 'empty.bin', [])
+    assert len(GraphStore(tmp_path / 'empty.bin')) == 0
+    with pytest.raises(ValueError):
+        write(tmp_path / 'small.bin', [(0, 1), (1, 5)], n=5)
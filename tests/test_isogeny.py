@@ -0,0 +1,69 @@
+import networkx as nx
+import pytest
+
+from isogeny import MODULAR_POLYNOMIALS, IsogenyGraph, search
+
+
+def brute_force_neighbors(graph, j):
+    # The y in GF(p²) with Φ_ℓ(j, y) = 0, evaluated straight from Φ_ℓ
+    F = graph.field
+    roots = []
+    for a in range(graph.p):
+        for b in range(graph.p):
+            y = F(a, b)
+            value = F.zero
+            for (i, k), c in MODULAR_POLYNOMIALS[graph.ell].items():
+                value = F.add(value, F.mul(F(c), F.mul(F.pow(j, i), F.pow(y, k))))
+            if value == F.zero:
+                roots.append(y)
+    return roots
+
+
+def supersingular_count(p):
+    return p // 12 + {1: 0, 5: 1, 7: 1, 11: 2}[p % 12]
+
+
+@pytest.mark.parametrize('p, ell', [(19, 2), (23, 2), (29, 3), (31, 3)])
+def test_roots_match_brute_force(p, ell):
+    graph = IsogenyGraph(p, ell)
+    seen = {graph.start()}
+    frontier = list(seen)
+    while frontier:
+        j = frontier.pop()
+        neighbors = graph.neighbors(j)
+        assert neighbors == brute_force_neighbors(graph, j)
+        frontier += [w for w in neighbors if w not in seen]
+        seen.update(neighbors)
+    assert len(seen) == supersingular_count(p)
+
+
+@pytest.mark.parametrize('p, ell', [(431, 2), (1031, 3)])
+def test_search_finds_shortest_paths(p, ell):
+    graph = IsogenyGraph(p, ell)
+    reference = nx.Graph()
+    frontier = [graph.start()]
+    while frontier:
+        j = frontier.pop()
+        for w in graph.neighbors(j):
+            if w not in reference:
+                frontier.append(w)
+            reference.add_edge(j, w)
+    vertices = sorted(reference)
+    for end in vertices[::len(vertices) // 5]:
+        path, stats = search(graph, graph.start(), end)
+        assert path[0] == graph.start() and path[-1] == end
+        assert all(reference.has_edge(u, v) for u, v in zip(path, path[1:]))
+        assert stats['length'] == nx.shortest_path_length(reference, graph.start(), end)
+
+
+def test_component_matches_neighbors():
+    graph = IsogenyGraph(1031)
+    jinvariants, edges = graph.component()
+    assert len(jinvariants) == supersingular_count(1031)
+    number = {tuple(int(c) for c in j): i for i, j in enumerate(jinvariants)}
+    adjacency = {i: set() for i in range(len(jinvariants))}
+    for u, v in edges.tolist():
+        adjacency[u].add(v)
+        adjacency[v].add(u)
+    for j, i in number.items():
+        assert {number[w] for w in graph.neighbors(j)} == adjacency[i]
@@ -0,0 +1,67 @@
+import threading
+import time
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from pipeline import Pipeline
+
+
+class FileWriter:
+    def __init__(self, delay=0):
+        self.delay = delay
+        self.written = []
+        self.closed = []
+        self.threads = set()
+
+    def write_frame(self, frame):
+        time.sleep(self.delay)
+        self.threads.add(threading.current_thread().name)
+        if frame[0, 0, 0] == 255:
+            raise BrokenPipeError
+        self.written.append(frame[0, 0, 0])
+
+    def close_movie_pipe(self):
+        self.closed.append(len(self.written))
+
+    def finish(self):
+        pass
+
+
+def scene(writer):
+    camera = SimpleNamespace(pixel_array=np.zeros((4, 6, 4), np.uint8))
+    return SimpleNamespace(renderer=SimpleNamespace(camera=camera, file_writer=writer))
+
+
+def test_frames_written_in_order_from_reused_buffers():
+    writer = FileWriter(delay=0.001)
+    s = scene(writer)
+    pipeline = Pipeline(s, depth=3)
+    held = s.renderer.get_frame()
+    for i in range(40):
+        s.renderer.camera.pixel_array[:] = i
+        frame = s.renderer.get_frame()
+        for _ in range(1 + i % 2):
+            writer.write_frame(frame)
+    writer.close_movie_pipe()
+    pipeline.close()
+    assert writer.written == [i for i in range(40) for _ in range(1 + i % 2)]
+    assert writer.closed == [len(writer.written)]
+    assert writer.threads == {'frame-writer'}
+    assert (held == 0).all()
+    # One buffer per queued frame, plus the one being rasterized and the
+    # one held, not one per frame
+    assert pipeline.allocated <= 3 + 3
+
+
+def test_write_errors_reach_the_main_thread():
+    writer = FileWriter()
+    s = scene(writer)
+    pipeline = Pipeline(s)
+    s.renderer.camera.pixel_array[:] = 255
+    writer.write_frame(s.renderer.get_frame())
+    with pytest.raises(BrokenPipeError):
+        writer.close_movie_pipe()
+    assert writer.closed == []
+    pipeline.close()
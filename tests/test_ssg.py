@@ -0,0 +1,10 @@
+import ssg
+
+
+def test_graphs_load_as_lists_of_neighbours():
+    for name, edges in (('ssg2', 129), ('ssg3', 171)):
+        graph = getattr(ssg, name)
+        assert list(graph) == list(range(87))
+        assert sum(map(len, graph.values())) == edges
+        assert all(w >= v for v, ws in graph.items() for w in ws)
+    assert ssg.ssg2 is ssg.load('ssg2')
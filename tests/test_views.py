@@ -0,0 +1,33 @@
+from collections import Counter
+
+import networkx as nx
+import numpy as np
+
+from views import BallView, CoarseView
+
+
+def edges(graph):
+    return Counter(tuple(sorted(e)) for e in graph.edges())
+
+
+def test_ball_view_is_induced_subgraph():
+    graph = nx.MultiGraph(nx.random_regular_graph(3, 200, seed=1))
+    graph.add_edge(0, 0)
+    view = BallView(graph).add_ball([0], 2)
+    shown = len(view.nodes)
+    positions = view.positions.copy()
+    view.add_ball([0], 3).add_path(nx.shortest_path(graph, 0, 150))
+    assert np.allclose(view.positions[:shown], positions)
+    assert edges(nx.MultiGraph(view.lists())) == edges(graph.subgraph(view.nodes))
+    assert np.allclose(BallView(graph).add_ball([0], 2).positions, positions)
+
+
+def test_coarse_view_partitions_vertices():
+    graph = nx.random_regular_graph(3, 2000, seed=2)
+    view = CoarseView(graph, target=50).show()
+    top = len(view.levels) - 1
+    assert len(view.nodes) <= 50
+    assert view.sizes.sum() == 2000
+    members = [view.members(top, v) for v in view.nodes]
+    assert sorted(np.concatenate(members).tolist()) == list(range(2000))
+    assert [len(m) for m in members] == view.sizes.tolist()
@@ -0,0 +1,30 @@
+import numpy as np
+
+from volcano import Volcano
+
+
+def test_volcano_levels():
+    # t² - 4p = -4⁴·479, so the 2-volcano has height 4 above its crater
+    volcano = Volcano(30881, 17291)
+    assert abs(volcano.trace) == 30
+    assert volcano.height == 4
+    assert np.bincount(volcano.depth).tolist() == [25, 25, 50, 100, 200]
+    degree = np.bincount(volcano.edges.ravel(), minlength=len(volcano))
+    assert (degree[volcano.depth == 4] == 1).all()
+    assert (degree[volcano.depth < 4] == 3).all()
+    crater = volcano.crater
+    edges = set(map(tuple, np.sort(volcano.edges, axis=1).tolist()))
+    assert all(tuple(sorted(e)) in edges for e in zip(crater, crater[1:] + crater[:1]))
+    for v in range(0, len(volcano), 17):
+        neighbors = {int(volcano.jinvariants[w]) for w in volcano.edges[
+            (volcano.edges == v).any(axis=1)].ravel() if w != v}
+        assert neighbors == set(volcano.neighbors(int(volcano.jinvariants[v])))
+
+
+def test_layout_keeps_levels_apart():
+    volcano = Volcano(30881, 17291)
+    positions = np.array(list(volcano.layout().values()))
+    radius = np.hypot(positions[:, 0], positions[:, 2])
+    for d in range(volcano.height):
+        assert radius[volcano.depth == d].max() < radius[volcano.depth == d + 1].min()
+    assert len(np.unique(positions.round(9), axis=0)) == len(volcano)
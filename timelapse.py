@@ -1,4 +1,9 @@
+import json
+import os
 from manim import *
+from manim.mobject.geometry import DEFAULT_DOT_RADIUS
+from manim.utils.color import Colors
+from updaters import TrackingScene, add_tracked_updater
 
 class MyText(Text):
     CONFIG = {
@@ -13,6 +18,55 @@ class Legend(MyText):
         'color': BLUE
         }
 
+class Counter(VMobject):
+    '''
+    An integer display drawing its digits, and minus sign, from glyphs
+    rendered once.
+
+    `set_value` does nothing unless the displayed integer changes, and then
+    only swaps which glyphs are shown, keeping the left edge in place.
+    Each glyph is centred in a slot as wide as "0".
+    '''
+    CONFIG = {
+        'digit_to_digit_buff': 0.05,
+    }
+
+    def __init__(self, number=0, **kwargs):
+        super().__init__(**kwargs)
+        self.glyphs = {c: SingleStringMathTex(c, **kwargs) for c in '0123456789-'}
+        self.advance = self.glyphs['0'].get_width() + self.digit_to_digit_buff
+        # From the bottom centre of a slot to the centre of its glyph: digits
+        # stand on the baseline, the minus sign sits at their mid-height
+        self.lift = {c: 0.5*g.get_height()*UP for c, g in self.glyphs.items()}
+        self.lift['-'] = 0.5*self.glyphs['0'].get_height()*UP
+        self.slots = []
+        self.number = None
+        self.set_value(number)
+
+    def set_value(self, number):
+        number = int(np.round(number))
+        if number == self.number:
+            return self
+        # The first slot's bottom centre, from where its glyph was placed
+        bottom = (self[0].get_center() - self.lift[str(self.number)[0]] if self.submobjects
+                  else 0.5*self.advance*RIGHT)
+        characters = str(number)
+        while len(self.slots) < len(characters):
+            self.slots.append({})
+        shown = []
+        for slot, c in zip(self.slots, characters):
+            if c not in slot:
+                slot[c] = self.glyphs[c].copy()
+            slot[c].move_to(bottom + len(shown)*self.advance*RIGHT + self.lift[c])
+            shown.append(slot[c])
+        self.submobjects = shown
+        self.number = number
+        return self
+
+    def get_value(self):
+        return self.number
+
+
 Mobject.CONFIG['color'] = BLACK
 Dot.CONFIG['color'] = BLACK
 Text.CONFIG = {
@@ -20,19 +74,21 @@ Text.CONFIG = {
     'color': BLACK,
 }
 
-class TimeLapse(Scene):
+class TimeLapse(TrackingScene):
     def construct(self):
         number_line = NumberLine(x_min=1996, x_max=2020, number_at_center=2008,
                                  unit_size=0.5, add_start=0.5, add_end=0.5).shift(2.9*DOWN)
         pointer = Triangle(fill_opacity=1).scale(0.1)
-        label = Integer(1996, group_with_commas=False)
-        label.add_updater(lambda m: m.next_to(pointer, DOWN))
-
+        label = Counter(1996)
         pointer_value = ValueTracker(1996)
-        pointer.add_updater(
-            lambda m: m.next_to( number_line.n2p(pointer_value.get_value()), DOWN)
+        add_tracked_updater(label, lambda m: m.next_to(pointer, DOWN), pointer_value)
+
+        add_tracked_updater(pointer,
+            lambda m: m.next_to( number_line.n2p(pointer_value.get_value()), DOWN),
+            pointer_value
         )
-        label.add_updater(lambda m: m.set_value(pointer_value.get_value()))
+        add_tracked_updater(label, lambda m: m.set_value(pointer_value.get_value()),
+                            pointer_value)
         self.add(number_line, pointer, label)
 
         couv = MyText("Couveignes' HHS").move_to([1,2.5,0])
@@ -94,6 +150,39 @@ class TimeLapse(Scene):
 
         self.wait()
 
+NIST_TABLE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'nist.json')
+
+LABEL_DIRECTIONS = {
+    'UP': UP, 'DOWN': DOWN, 'LEFT': LEFT, 'RIGHT': RIGHT,
+    'UR': UR, 'UL': UL, 'DR': DR, 'DL': DL,
+}
+
+
+def load_chart(name, path=NIST_TABLE):
+    with open(path) as f:
+        return json.load(f)[name]
+
+
+def total(v):
+    return sum(v) if isinstance(v, list) else v
+
+
+class DotCloud(VMobject):
+    '''
+    Many dots of the same colour, as a single mobject.
+    '''
+    CONFIG = {
+        'radius': DEFAULT_DOT_RADIUS,
+        'stroke_width': 0,
+        'fill_opacity': 1.0,
+    }
+
+    def __init__(self, points, **kwargs):
+        super().__init__(**kwargs)
+        template = Dot(radius=self.radius).get_points()
+        self.set_points((np.asarray(points)[:, None, :] + template).reshape(-1, 3))
+
+
 class NIST(Mobject):
     def __init__(self, xmin, xmax, ymin, ymax,
                  basex=2, basey=2,
@@ -114,6 +203,11 @@ class NIST(Mobject):
                                 unit_size=y_axis_height / (ylogmax - ylogmin),
                                 include_ticks=False)
         self.yaxis.shift(LEFT * y_axis_height / 2).rotate(PI / 2)
+        # Both axes are affine: keep their ends to map whole arrays at once
+        self.xends = np.array([xlogmin, xlogmax]), self.xaxis.n2p(xlogmin), self.xaxis.n2p(xlogmax)
+        self.yends = np.array([ylogmin, ylogmax]), self.yaxis.n2p(ylogmin), self.yaxis.n2p(ylogmax)
+        # Bounding boxes (x0, y0, x1, y1) of everything drawn on the chart
+        self.placed = np.zeros((0, 4))
     
     def logx(self, x):
         return np.log(x)/np.log(self.basex)
@@ -122,82 +216,99 @@ class NIST(Mobject):
         return np.log(y)/np.log(self.basey)
     
     def c2p(self, size, speed):
-        return self.xaxis.n2p(self.logx(size)) + self.yaxis.n2p(self.logy(speed))
+        '''
+        Chart point of a size and speed, or of arrays of them.
+        '''
+        point = 0
+        for v, ((lo, hi), start, end) in ((self.logx(np.asarray(size)), self.xends),
+                                          (self.logy(np.asarray(speed)), self.yends)):
+            point = point + start + np.multiply.outer((v - lo) / (hi - lo), end - start)
+        return point
 
     def system(self, name, size, speed, label_pos=UP, **kwargs):
         sys = Dot(self.c2p(size, speed), **kwargs)
         return Group(sys, Text(name, **kwargs).next_to(sys, label_pos))
 
+    def overlaps(self, box):
+        p = self.placed
+        return np.any((p[:, 0] < box[2]) & (box[0] < p[:, 2])
+                      & (p[:, 1] < box[3]) & (box[1] < p[:, 3]))
 
-class KEM(Scene):
-    def construct(self):
-        nist = NIST(100, 300000, 80, 1.1*10**6)
-        
-        self.play(ShowCreation(nist.xaxis), ShowCreation(nist.yaxis),
-                  Write(Text('small').next_to(nist.xaxis, LEFT)),
-                  Write(Text('large').next_to(nist.xaxis, RIGHT)),
-                  Write(Text('fast').next_to(nist.yaxis, DOWN)),
-                  Write(Text('slow').next_to(nist.yaxis, UP)),
-                  )
-        
-        self.wait()
+    def place(self, box):
+        self.placed = np.vstack([self.placed, box])
+
+    def systems(self, rows, radius=DEFAULT_DOT_RADIUS):
+        '''
+        The dots and labels of rows of a chart table: one DotCloud per
+        colour, and labels placed to avoid each other and all dots.
+        '''
+        points = self.c2p([total(r['size']) for r in rows],
+                          [total(r['cycles']) for r in rows]).reshape(-1, 3)
+        colors = [Colors[r['color'].lower()].value for r in rows]
+        clouds = [DotCloud(points[[c == col for c in colors]], radius=radius, color=col)
+                  for col in dict.fromkeys(colors)]
+        for p in points:
+            self.place(np.concatenate([p[:2] - radius, p[:2] + radius]))
+
+        labels = []
+        for row, point, color in zip(rows, points, colors):
+            label = Text(row['name'], color=color)
+            first = LABEL_DIRECTIONS[row.get('label', 'UP')]
+            for direction in [first, *LABEL_DIRECTIONS.values()]:
+                label.next_to(point, direction, buff=DEFAULT_MOBJECT_TO_MOBJECT_BUFFER + radius)
+                box = np.concatenate([label.get_corner(DL)[:2], label.get_corner(UR)[:2]])
+                if not self.overlaps(box):
+                    break
+            else:
+                label.next_to(point, first, buff=DEFAULT_MOBJECT_TO_MOBJECT_BUFFER + radius)
+                box = np.concatenate([label.get_corner(DL)[:2], label.get_corner(UR)[:2]])
+            self.place(box)
+            labels.append(label)
+        return Group(*clouds, *labels)
 
-        self.play(FadeIn(nist.system('SIKE', 330+346, 9681+10343, RIGHT, color=BLUE_E)))
-        self.play(FadeIn(nist.system('compressed SIKE', 197+236, 15120+11077, LEFT, color=BLUE_E)))
-        self.wait()
-        self.play(FadeIn(nist.system('McEliece', 261120+128, 44+134, color=RED_D)))
-        self.play(FadeIn(nist.system('HQC', 2249+4481, 220+384, color=RED_E)))
-        self.play(FadeIn(nist.system('BIKE', 12323+12579, 220+2220, RIGHT, color=RED_E)))
-        self.wait()
-        self.play(FadeIn(nist.system('Kyber', 800+736, 49+40, LEFT, color=GREEN_D)))
-        self.play(FadeIn(nist.system('NTRU', 699+699, 761+1940, color=GREEN_E)))
-        self.play(FadeIn(nist.system('Saber', 672+736, 61+63, color=GREEN_D)))
-        self.play(FadeIn(nist.system('Frodo', 9616+9720, 1862+1747, color=GREEN_D)))
-        self.play(FadeIn(nist.system('NTRU prime', 994+897, 47+59, RIGHT, color=GREEN_E)))
-        self.wait()
-        
-        csidh = nist.system('CSIDH', 64+64+32, 155000, RIGHT, color=BLUE_D)
-        self.play(FadeIn(csidh))
-        self.wait()
-        self.play(csidh.move_to, nist.c2p(512+512+32, 10**6))
-        self.wait()
 
-class Sign(Scene):
+class NISTChart(Scene):
+    '''
+    Build a NIST chart from its table in nist.json, one step at a time.
+    '''
+    chart = None
+
     def construct(self):
-        nist = NIST(200, 400000, 80, 10**9)
-        
+        table = load_chart(self.chart)
+        nist = NIST(*table['bounds'])
+
         self.play(ShowCreation(nist.xaxis), ShowCreation(nist.yaxis),
                   Write(Text('small').next_to(nist.xaxis, LEFT)),
                   Write(Text('large').next_to(nist.xaxis, RIGHT)),
                   Write(Text('fast').next_to(nist.yaxis, DOWN)),
                   Write(Text('slow').next_to(nist.yaxis, UP)),
                   )
+        if table['axes_wait']:
+            self.wait()
 
-        sec = 3*10**6
-        msec = sec / 1000
-        self.play(FadeIn(nist.system('SIDH', 10**5, 1*sec, color=BLUE_E)))
-        self.wait()
-        self.play(FadeIn(nist.system('CSIDH', 2000, 100*sec, color=BLUE_D)))
-        self.wait()
-        self.play(FadeIn(nist.system('CSI-FiSh', 512+956, 2*1.48*sec, color=BLUE_D)))
-        self.wait()
+        last = 1 + max((r['step'] for r in table['schemes'] if 'step' in r), default=-1)
+        steps = {}
+        for row in table['schemes']:
+            steps.setdefault(row.get('step', last), []).append(row)
+        for step, rows in sorted(steps.items()):
+            still = [r for r in rows if 'then' not in r]
+            moving = [r for r in rows if 'then' in r]
+            groups = [nist.systems([r]) for r in moving]
+            self.play(*(FadeIn(g) for g in groups + ([nist.systems(still)] if still else [])))
+            if step in table['waits']:
+                self.wait()
+            for row, group in zip(moving, groups):
+                then = row['then']
+                self.play(group.move_to, nist.c2p(total(then['size']), total(then['cycles'])))
+                self.wait()
 
-        self.play(
-            FadeIn(nist.system('Dilithium', 1184+2044, 313+109, RIGHT, color=GREEN_D)),
-            FadeIn(nist.system('Falcon', 897+666, 2.3*10**6*(1./5948 + 1./27933), LEFT, color=GREEN_D)),
-        )
-        self.play(
-            FadeIn(nist.system('Rainbow', 157800+528./8, 67+34, color=RED_E)),
-            FadeIn(nist.system('GeMSS', 352188+258./8, 736000+80, color=RED_E)),
-        )
-        self.play(
-            FadeIn(nist.system('Picnic', 32+34032, (1.37+1.10)*msec, color=ORANGE)),
-            FadeIn(nist.system('SPHINCS+', 32+17088, 68541846+4801338, color=ORANGE)),
-        )
-        self.wait()
 
-        self.play(FadeIn(nist.system('SQISign', 64+204, 7767000+142000, color=BLUE_C)))
-        self.wait()
+class KEM(NISTChart):
+    chart = 'KEM'
+
+
+class Sign(NISTChart):
+    chart = 'Sign'
 
 
 class Intro(Scene):
@@ -0,0 +1,59 @@
+'''
+Updaters that declare the value trackers they depend on.
+
+A `TrackedUpdater` skips its function while its trackers hold the values
+seen on its last run.  `TrackingScene` uses the same information to leave
+mobjects that only have such updaters out of the per-frame redraw, unless
+one of their trackers is animated by the current `play`.
+'''
+
+from manim import *
+
+
+class TrackedUpdater:
+    def __init__(self, func, *trackers):
+        self.func = func
+        self.trackers = trackers
+        self.seen = None
+
+    def values(self):
+        return tuple(t.get_value() for t in self.trackers)
+
+    def is_dirty(self):
+        return self.values() != self.seen
+
+    def __call__(self, mob):
+        values = self.values()
+        if values != self.seen:
+            self.seen = values
+            self.func(mob)
+
+
+def add_tracked_updater(mob, func, *trackers):
+    return mob.add_updater(TrackedUpdater(func, *trackers))
+
+
+class TrackingScene(Scene):
+    def is_static(self, mob, moving):
+        '''
+        Whether `mob` will keep still for a whole animation moving the
+        mobjects in `moving` (a set of ids).
+        '''
+        for updater in mob.get_family_updaters():
+            if not isinstance(updater, TrackedUpdater) or updater.is_dirty():
+                return False
+            for tracker in updater.trackers:
+                if id(tracker) in moving or tracker.get_family_updaters():
+                    return False
+        return True
+
+    def get_moving_mobjects(self, *animations):
+        animation_mobjects = [a.mobject for a in animations if a.mobject is not None]
+        moving = {id(m) for mob in animation_mobjects for m in mob.get_family()}
+        mobjects = self.get_mobject_family_members()
+        for i, mob in enumerate(mobjects):
+            if (mob in animation_mobjects
+                or mob in self.foreground_mobjects
+                or (mob.get_family_updaters() and not self.is_static(mob, moving))):
+                return mobjects[i:]
+        return []
@@ -0,0 +1,302 @@
+'''
+Views of graphs too large to draw whole.
+
+A `BallView` shows the part of a graph around some vertices, or along some
+paths, and grows as more is added.  A `CoarseView` collapses a graph into
+super-nodes by repeated heavy-edge matching, and shows one level of the
+hierarchy.  Both lay out only what they show, and `graph()` turns them
+into a `supersingular.Graph`.
+
+Graphs can be given as networkx graphs, as lists of neighbours like
+`ssg2`, or as any object with a `neighbors` method, such as a
+`graphstore.GraphStore` or an `isogeny.IsogenyGraph`.
+'''
+
+import networkx as nx
+import numpy as np
+
+
+def neighbors_function(source):
+    '''
+    A function returning the neighbours of a vertex of `source`, with
+    multiplicity.
+    '''
+    if isinstance(source, dict):
+        source = nx.MultiGraph(source)
+    if isinstance(source, nx.Graph):
+        if source.is_multigraph():
+            return lambda v: [w for w, keys in source[v].items() for _ in keys]
+        return lambda v: list(source[v])
+
+    def neighbors(v):
+        ns = source.neighbors(v)
+        return ns.tolist() if hasattr(ns, 'tolist') else list(ns)
+    return neighbors
+
+
+def relax(positions, edges, movable, length, iterations=50, sample=256, seed=0):
+    '''
+    Move the `movable` rows of `positions` by Fruchterman-Reingold forces
+    with ideal edge length `length`.  Repulsion is estimated from at most
+    `sample` vertices, so each iteration costs O(len(edges) + movable).
+    '''
+    movable = np.flatnonzero(movable)
+    if not len(movable):
+        return positions
+    a, b = np.asarray(edges, dtype=np.int64).reshape(-1, 2).T
+    rng = np.random.default_rng(seed)
+    step = length
+    for _ in range(iterations):
+        force = np.zeros_like(positions)
+        d = positions[b] - positions[a]
+        dist = np.maximum(np.linalg.norm(d, axis=1, keepdims=True), 1e-9)
+        pull = dist * d / length
+        np.add.at(force, a, pull)
+        np.add.at(force, b, -pull)
+        others = np.arange(len(positions))
+        if len(others) > sample:
+            others = rng.choice(others, sample, replace=False)
+        d = positions[movable, None, :] - positions[None, others, :]
+        dist2 = np.maximum(np.einsum('ijk,ijk->ij', d, d), 1e-4 * length**2)
+        push = length**2 * len(positions) / len(others)
+        force[movable] += push * np.einsum('ijk,ij->ik', d, 1 / dist2)
+        force = force[movable]
+        norm = np.maximum(np.linalg.norm(force, axis=1, keepdims=True), 1e-9)
+        positions[movable] += force / norm * np.minimum(norm, step)
+        step *= 0.92
+    return positions
+
+
+def fresh_layout(n, edges, length, seed=0):
+    '''
+    A Kamada-Kawai layout of vertices 0..n-1, scaled to edges `length` long,
+    started from a random layout drawn with `seed`.
+    '''
+    graph = nx.Graph()
+    graph.add_nodes_from(range(n))
+    graph.add_edges_from((a, b) for a, b in edges if a != b)
+    layout = nx.kamada_kawai_layout(graph, pos=nx.random_layout(graph, dim=3, seed=seed),
+                                    dim=3)
+    positions = np.array([layout[i] for i in range(n)]).reshape(n, 3)
+    if graph.number_of_edges():
+        a, b = np.array(list(graph.edges)).T
+        positions *= length / np.linalg.norm(positions[a] - positions[b], axis=1).mean()
+    return positions
+
+
+class View:
+    '''
+    A laid out subgraph: `nodes`, `edges` between them, each listed once,
+    and `positions` of the nodes.
+    '''
+    def __init__(self):
+        self.nodes = []
+        self.number = {}
+        self.edges = []
+        self.positions = np.zeros((0, 3))
+
+    def lists(self):
+        # networkx only keeps an edge listed under the earlier of its ends
+        lists = {v: [] for v in self.nodes}
+        for i, k in self.edges:
+            i, k = min(i, k), max(i, k)
+            lists[self.nodes[i]].append(self.nodes[k])
+        return lists
+
+    def layout(self):
+        return dict(zip(self.nodes, self.positions))
+
+    def graph(self, **kwargs):
+        from supersingular import Graph
+        return Graph([self.lists()], layout=self.layout(), **kwargs)
+
+
+class BallView(View):
+    '''
+    The subgraph of `source` spanned by balls and paths added to the view.
+    New vertices are placed next to their shown neighbours, and only they
+    are relaxed, so the rest of the drawing stays still.
+    '''
+    def __init__(self, source, length=0.25, seed=0):
+        super().__init__()
+        self.neighbors = neighbors_function(source)
+        self.length = length
+        self.seed = seed
+        self.rng = np.random.default_rng(seed)
+        self.adjacency = {}
+
+    def _neighbors(self, v):
+        if v not in self.adjacency:
+            self.adjacency[v] = self.neighbors(v)
+        return self.adjacency[v]
+
+    def add_ball(self, centers, radius):
+        '''
+        Add the vertices at distance at most `radius` from `centers`.
+        '''
+        ball = dict.fromkeys(centers)
+        frontier = list(ball)
+        for _ in range(radius):
+            frontier = [w for v in frontier for w in self._neighbors(v) if w not in ball]
+            ball.update(dict.fromkeys(frontier))
+        return self.add(ball)
+
+    def add_path(self, *paths):
+        return self.add(dict.fromkeys(v for path in paths for v in path))
+
+    def add(self, vertices):
+        new = [v for v in vertices if v not in self.number]
+        if not new:
+            return self
+        start = len(self.nodes)
+        for v in new:
+            self.number[v] = len(self.nodes)
+            self.nodes.append(v)
+        # Edges from the new vertices to all shown ones, each listed once
+        for v in new:
+            i = self.number[v]
+            for w in self._neighbors(v):
+                k = self.number.get(w)
+                if k is not None and (k < start or k >= i):
+                    self.edges.append((i, k))
+        if start == 0:
+            # The first vertices get a fresh layout
+            self.positions = fresh_layout(len(new), self.edges, self.length, self.seed)
+        else:
+            self.positions = np.vstack([self.positions, self._place(new, start)])
+        relax(self.positions, self.edges, np.arange(len(self.nodes)) >= start, self.length)
+        return self
+
+    def _place(self, new, start):
+        # Next to the mean of the shown neighbours, or at random
+        positions = np.empty((len(new), 3))
+        for n, v in enumerate(new):
+            placed = [self.number[w] for w in self._neighbors(v)
+                      if self.number.get(w, start) < start]
+            centre = self.positions[placed].mean(axis=0) if placed else np.zeros(3)
+            positions[n] = centre + self.rng.normal(scale=self.length, size=3)
+        return positions
+
+
+def adjacency_arrays(source):
+    '''
+    The vertices of `source`, and its edges in both directions as arrays
+    of vertex numbers.
+    '''
+    if hasattr(source, 'indptr'):
+        indptr = np.asarray(source.indptr)
+        rows = np.repeat(np.arange(len(indptr) - 1), np.diff(indptr))
+        return np.arange(len(indptr) - 1), rows, np.asarray(source.indices, dtype=np.int64)
+    if isinstance(source, dict):
+        source = nx.MultiGraph(source)
+    nodes = list(source.nodes)
+    number = {v: i for i, v in enumerate(nodes)}
+    edges = np.array([(number[u], number[v]) for u, v in source.edges()],
+                     dtype=np.int64).reshape(-1, 2)
+    return (np.array(nodes), np.concatenate([edges[:, 0], edges[:, 1]]),
+            np.concatenate([edges[:, 1], edges[:, 0]]))
+
+
+class CoarseView(View):
+    '''
+    A hierarchy of coarsenings of `source`, built by matching every vertex
+    with the neighbour it shares the heaviest edge with, until at most
+    `target` super-nodes remain.  Edge weights count the original edges
+    between super-nodes, and node weights the vertices they contain.
+
+    The coarsest level is laid out whole; finer levels start from the
+    positions of their super-nodes, so `show(level)` only costs the size of
+    that level.
+    '''
+    def __init__(self, source, target=100, length=0.25, seed=0):
+        super().__init__()
+        self.labels, rows, cols = adjacency_arrays(source)
+        self.length = length
+        self.seed = seed
+        self.rng = np.random.default_rng(seed)
+        n = len(self.labels)
+        # Levels, finest first: (rows, cols, weights) of the edges and node
+        # weights.  parents[i] maps the nodes of level i to level i + 1.
+        self.levels = [self._combine(rows, cols, np.ones(len(rows)), n) + (np.ones(n),)]
+        self.parents = []
+        while len(self.levels[-1][3]) > target:
+            parent = self._match(*self.levels[-1])
+            m = parent.max() + 1
+            if m > 0.9 * len(parent):
+                break
+            rows, cols, weights, sizes = self.levels[-1]
+            self.parents.append(parent)
+            self.levels.append(self._combine(parent[rows], parent[cols], weights, m)
+                               + (np.bincount(parent, sizes, m),))
+        self.placed = {}
+
+    @staticmethod
+    def _combine(rows, cols, weights, n):
+        # Merge parallel edges, drop loops
+        keep = rows != cols
+        keys, inverse = np.unique(rows[keep] * n + cols[keep], return_inverse=True)
+        return keys // n, keys % n, np.bincount(inverse, weights[keep])
+
+    def _match(self, rows, cols, weights, sizes):
+        n = len(sizes)
+        partner = np.full(n, -1)
+        # Heavy edges, normalised by size to keep super-nodes balanced
+        score = weights / (sizes[rows] * sizes[cols]) + 1e-9 * self.rng.random(len(rows))
+        for _ in range(5):
+            free = (partner[rows] < 0) & (partner[cols] < 0)
+            if not free.any():
+                break
+            best = self._best(rows[free], cols[free], score[free], n)
+            mutual = np.flatnonzero((best >= 0) & (best[np.maximum(best, 0)] == np.arange(n)))
+            partner[mutual] = best[mutual]
+        representative = np.where(partner >= 0, np.minimum(np.arange(n), partner), np.arange(n))
+        # Vertices left alone join the pair of their heaviest matched neighbour
+        alone = (partner[rows] < 0) & (partner[cols] >= 0)
+        best = self._best(rows[alone], cols[alone], score[alone], n)
+        joining = np.flatnonzero(best >= 0)
+        representative[joining] = representative[best[joining]]
+        return np.unique(representative, return_inverse=True)[1]
+
+    @staticmethod
+    def _best(rows, cols, score, n):
+        # The column of highest score in each row, or -1
+        order = np.lexsort((score, rows))
+        last = np.r_[rows[order][1:] != rows[order][:-1], True] if len(rows) else []
+        best = np.full(n, -1)
+        best[rows[order][last]] = cols[order][last]
+        return best
+
+    def members(self, level, node):
+        '''
+        The original vertices collapsed into `node` of `level`.
+        '''
+        mask = np.arange(len(self.levels[level][3])) == node
+        for parent in reversed(self.parents[:level]):
+            mask = mask[parent]
+        return self.labels[mask]
+
+    def positions_of(self, level):
+        if level not in self.placed:
+            rows, cols, weights, sizes = self.levels[level]
+            edges = np.stack([rows, cols], axis=1)[rows < cols]
+            if level == len(self.levels) - 1:
+                positions = fresh_layout(len(sizes), edges.tolist(), self.length, self.seed)
+            else:
+                positions = self.positions_of(level + 1)[self.parents[level]].copy()
+                positions += self.rng.normal(scale=0.1 * self.length, size=positions.shape)
+                relax(positions, edges, np.ones(len(sizes), bool), self.length, iterations=20)
+            self.placed[level] = positions
+        return self.placed[level]
+
+    def show(self, level=-1):
+        '''
+        Make the view show `level` of the hierarchy, the coarsest by default.
+        '''
+        level %= len(self.levels)
+        rows, cols, weights, sizes = self.levels[level]
+        self.nodes = list(range(len(sizes)))
+        self.number = {v: v for v in self.nodes}
+        self.edges = list(zip(*(x.tolist() for x in (rows[rows < cols], cols[rows < cols]))))
+        self.positions = self.positions_of(level)
+        self.sizes = sizes
+        return self
@@ -0,0 +1,189 @@
+'''
+Volcanoes of ℓ-isogenies between ordinary elliptic curves over GF(p).
+
+The ordinary curves over GF(p) linked to a curve by ℓ-isogenies form a
+volcano: a cycle of curves, the crater, each at the top of a tree of
+curves with smaller endomorphism rings, down to the floor.  Curves above
+the floor have ℓ + 1 neighbours, those on the floor a single one.
+
+`Volcano` explores the volcano of a j-invariant a breadth-first level at
+a time.  For ℓ = 2 the levels are expanded with the array arithmetic of
+field.py, for other ℓ curve by curve.  It recovers the levels by peeling
+off the floor repeatedly.  `layout` places the curves analytically, with
+no iteration, so that volcanoes of thousands of curves are laid out
+instantly.
+'''
+
+import numpy as np
+from field import GFp
+from isogeny import IsogenyGraph
+
+
+def trace(p, j):
+    '''
+    The trace of Frobenius of a curve over GF(p) with j-invariant `j`,
+    from the Legendre symbols of its right-hand side; 0 when the curve is
+    supersingular.
+    '''
+    F = GFp(p)
+    a, b = (0, 1) if j % p == 0 else (1, 0) if j % p == 1728 % p else (None, None)
+    if a is None:
+        k = j * pow(1728 - j, -1, p) % p
+        a, b = 3*k % p, 2*k % p
+    x = F.array(np.arange(p))
+    return -int(F.legendre(F.add(F.mul(F.mul(x, x), x), F.add(F.mul(a, x), b))).sum())
+
+
+class Volcano:
+    '''
+    The ℓ-volcano of the ordinary curve with j-invariant `j` over GF(p).
+
+    Curves are numbered in breadth-first order from `j`.  `jinvariants`
+    holds their j-invariants, `edges` the distinct pairs of neighbours,
+    `depth` the level of each curve, 0 on the crater and `height` on the
+    floor, and `parent` its neighbour one level up, -1 on the crater.
+    `crater` lists the crater curves in cyclic order.
+    '''
+    def __init__(self, p, j, ell=2):
+        self.p = p
+        self.ell = ell
+        self.trace = trace(p, j)
+        if self.trace == 0:
+            raise ValueError('j = %d is supersingular over GF(%d)' % (j, p))
+        self.graph = IsogenyGraph(p, ell)
+        self.field = GFp(p)
+        self.jinvariants, self.edges = self._explore(j % p)
+        self._levels()
+
+    def neighbors(self, j):
+        '''
+        The distinct j-invariants in GF(p) of the curves ℓ-isogenous to `j`.
+        '''
+        return [a for a, b in self.graph.neighbors((j, 0)) if b == 0]
+
+    def _children(self, js, parents):
+        # The neighbours of js other than parents, flattened, with the
+        # index in js of the curve each comes from
+        if self.ell != 2:
+            found = [[w for w in self.neighbors(j) if w != parent]
+                     for j, parent in zip(js.tolist(), parents.tolist())]
+            return (np.array([w for ws in found for w in ws], dtype=np.int64),
+                    np.repeat(np.arange(len(js)), [len(ws) for ws in found]))
+        F = self.field
+        c0, c1, c2 = (F.polyval(self.graph.coefficients[k], js) for k in range(3))
+        # Y³ + c2 Y² + c1 Y + c0 = (Y - parent)(Y² + B Y + C), whose other
+        # roots are in GF(p) when the discriminant is a square
+        B = F.add(c2, parents)
+        C = F.add(c1, F.mul(parents, B))
+        disc = F.sub(F.mul(B, B), F.mul(4, C))
+        rational = np.flatnonzero(F.is_square(disc))
+        root = F.sqrt(disc[rational])
+        half = (self.p + 1) // 2
+        B = B[rational]
+        return (np.concatenate([F.mul(F.sub(root, B), half), F.mul(F.sub(F.neg(root), B), half)]),
+                np.concatenate([rational, rational]))
+
+    def _explore(self, j):
+        # The start has no parent: its neighbours are found by themselves
+        frontier = np.array([w for w in self.neighbors(j) if w != j], dtype=np.int64)
+        parents = np.full(len(frontier), j)
+        known = np.union1d(frontier, [j])
+        vertices = [np.array([j]), frontier]
+        pairs = [np.stack([parents, frontier], axis=1)]
+        while len(frontier):
+            children, origin = self._children(frontier, parents)
+            pairs.append(np.stack([frontier[origin], children], axis=1))
+            new, index = np.unique(children, return_index=True)
+            new, index = new[~np.isin(new, known)], index[~np.isin(new, known)]
+            frontier, parents = new, frontier[origin[index]]
+            known = np.union1d(known, new)
+            vertices.append(frontier)
+        jinvariants = np.concatenate(vertices)
+        order = np.argsort(jinvariants)
+        number = lambda j: order[np.searchsorted(jinvariants, j, sorter=order)]
+        edges = number(np.concatenate(pairs))
+        edges = np.unique(np.sort(edges, axis=1), axis=0)
+        return jinvariants, edges
+
+    def _levels(self):
+        n = len(self.jinvariants)
+        u, v = self.edges[self.edges[:, 0] != self.edges[:, 1]].T
+        alive = np.ones(n, bool)
+        removed = np.zeros(n, np.int64)
+        rounds = 0
+        while True:
+            live = alive[u] & alive[v]
+            degree = np.bincount(u[live], minlength=n) + np.bincount(v[live], minlength=n)
+            floor = alive & (degree <= 1)
+            if not floor.any() or floor.sum() == alive.sum():
+                break
+            rounds += 1
+            removed[floor] = rounds
+            alive &= ~floor
+        self.height = rounds
+        self.depth = np.where(alive, 0, rounds + 1 - removed)
+        self.parent = np.full(n, -1)
+        down = self.depth[v] == self.depth[u] + 1
+        self.parent[v[down]] = u[down]
+        up = self.depth[u] == self.depth[v] + 1
+        self.parent[u[up]] = v[up]
+
+        # Walk around the crater
+        crater = np.flatnonzero(alive)
+        on = set(crater.tolist())
+        around = {c: [] for c in on}
+        for a, b in zip(u.tolist(), v.tolist()):
+            if a in on and b in on:
+                around[a].append(b)
+                around[b].append(a)
+        self.crater = [int(crater[0])]
+        while len(self.crater) < len(crater):
+            step = [c for c in around[self.crater[-1]] if c not in self.crater[-2:]]
+            if not step:
+                # Not a cycle, as around j = 0 and 1728
+                self.crater += sorted(on - set(self.crater))
+                break
+            self.crater.append(step[0])
+
+    def __len__(self):
+        return len(self.jinvariants)
+
+    def lists(self):
+        '''
+        The volcano as lists of neighbours, each edge listed once under its
+        lower-numbered end, like `ssg2`.
+        '''
+        lists = {i: [] for i in range(len(self))}
+        for a, b in self.edges.tolist():
+            lists[a].append(b)
+        return lists
+
+    def layout(self, radius=0.35, drop=0.8):
+        '''
+        Positions of the curves with the volcano upright along the y axis.
+        The crater lies on a horizontal circle of `radius`, and level d on
+        a circle of radius `radius + (1 - radius)·d/height`, `drop·d/height`
+        lower.  Each crater curve owns an equal sector of the circle, and
+        every curve splits its sector evenly between its children, so
+        trees never cross.
+        '''
+        n = len(self)
+        width = np.zeros(n)
+        start = np.zeros(n)
+        crater = np.array(self.crater)
+        width[crater] = 2*np.pi / len(crater)
+        start[crater] = np.arange(len(crater)) * width[crater]
+        for d in range(1, self.height + 1):
+            level = np.flatnonzero(self.depth == d)
+            level = level[np.argsort(self.parent[level], kind='stable')]
+            parent = self.parent[level]
+            rank = np.arange(len(level)) - np.searchsorted(parent, parent)
+            width[level] = width[parent] / np.bincount(parent, minlength=n)[parent]
+            start[level] = start[parent] + rank * width[level]
+        angle = start + width / 2
+        fraction = self.depth / max(self.height, 1)
+        r = np.where(self.depth == 0, radius if len(crater) > 1 else 0,
+                     radius + (1 - radius) * fraction)
+        positions = np.stack([r * np.cos(angle), drop * (0.5 - fraction),
+                              r * np.sin(angle)], axis=1)
+        return dict(enumerate(positions))
@@ -0,0 +1,80 @@
+'''
+Reproducible random walks on graphs.
+
+A walk is drawn from its own seeded generator, and stored with its seed
+in a small JSON file in the media directory, keyed by a hash of the graph
+it walks on.  Later renders replay the stored walk, so that they produce
+the same animations and hit the same cached partial movies.
+'''
+
+import json
+import os
+import random
+import tempfile
+
+
+def default_path():
+    from manim import config
+    return os.path.join(config.get_dir('media_dir'), 'walks.json')
+
+
+class WalkStore:
+    def __init__(self, path=None):
+        self.path = path or default_path()
+        try:
+            with open(self.path) as f:
+                self.walks = json.load(f)
+        except FileNotFoundError:
+            self.walks = {}
+
+    def key(self, graph_hash, start, steps, seed):
+        return '%s/%s/%d/%d' % (graph_hash, start, steps, seed)
+
+    def get(self, graph_hash, start, steps, seed):
+        entry = self.walks.get(self.key(graph_hash, start, steps, seed))
+        return entry and entry['walk']
+
+    def put(self, graph_hash, start, steps, seed, walk):
+        self.walks[self.key(graph_hash, start, steps, seed)] = {
+            'seed': seed,
+            'walk': walk,
+        }
+        # A private temporary file, so that concurrent renders do not mix
+        # their writes; the last one to finish wins.
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        with tempfile.NamedTemporaryFile('w', dir=directory, suffix='.tmp',
+                                         delete=False) as f:
+            json.dump(self.walks, f)
+        os.replace(f.name, self.path)
+
+
+def random_walk(neighbors, start, steps, seed):
+    '''
+    A non-backtracking random walk of `steps` steps, unless at a dead end.
+    '''
+    rng = random.Random(seed)
+    prev, cur = None, start
+    walk = [start]
+    for i in range(steps):
+        candidates = list(neighbors(cur))
+        if prev in candidates:
+            candidates.remove(prev)
+        next = rng.choice(candidates) if candidates else prev
+        walk.append(next)
+        prev, cur = cur, next
+    return walk
+
+
+def seeded_walk(graph, start, steps, seed=0, layer=0, store=None):
+    '''
+    The vertices of a random walk on a layer of `graph`, replayed from
+    `store` when it was generated before.
+    '''
+    store = store if store is not None else WalkStore()
+    graph_hash = graph.graph_hash(layer)
+    walk = store.get(graph_hash, start, steps, seed)
+    if walk is None:
+        walk = random_walk(graph.graphs[layer].neighbors, start, steps, seed)
+        store.put(graph_hash, start, steps, seed, walk)
+    return walk